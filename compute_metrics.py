@@ -12,98 +12,369 @@ Usage:
 """
 
 import boto3
-import json
+import csv
+import gzip
+import orjson
 import os
 import re
 import shutil
 import time
-from datetime import datetime
+import zstandard
+from botocore.config import Config
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import unquote_plus
 
-from metrics_path_rules import exclude_key_for_folder_modified_date
+from metrics_path_rules import is_excluded_segment, modified_date_min_depth
 
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "kgx-translator-ingests")
 METRICS_FILE = Path(os.environ.get("METRICS_FILE", Path(__file__).parent / "metrics.json"))
-S3_CLIENT = boto3.client("s3")
+# A METRICS_FILE ending in .zst is written as compact, zstd-compressed JSON
+METRICS_COMPRESSED = METRICS_FILE.suffix == ".zst"
+
+# Folder listings are I/O-bound, so they run concurrently. boto3 clients are
+# thread-safe; the connection pool is sized so workers never wait on a socket.
+METRICS_WORKERS = int(os.environ.get("METRICS_WORKERS", "32"))
+S3_CLIENT = boto3.client(
+    "s3",
+    config=Config(
+        max_pool_connections=METRICS_WORKERS * 2,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        tcp_keepalive=True,
+    ),
+)
+# Ask for the most keys list_objects_v2 returns per call
+LIST_PAGINATION = {"PageSize": 1000}
 
 # Timestamped copies of metrics.json (metrics-YYYYMMDD-HHMMSS.json); keep newest only.
 MAX_METRICS_ARCHIVES = 3
-_METRICS_ARCHIVE_NAME = re.compile(r"^metrics-\d{8}-\d{6}\.json$")
+_METRICS_ARCHIVE_NAME = re.compile(r"^metrics-\d{8}-\d{6}\.json(\.zst)?$")
+
+# Optional S3 Inventory report to aggregate instead of listing the bucket: the
+# s3:// folder holding the dated report folders, e.g.
+# s3://inventory-bucket/kgx/kgx-translator-ingests/daily-csv/. Reports older than
+# INVENTORY_MAX_AGE_HOURS (or not in CSV format) fall back to a live listing.
+INVENTORY_LOCATION = os.environ.get("INVENTORY_LOCATION", "")
+INVENTORY_MAX_AGE_HOURS = float(os.environ.get("INVENTORY_MAX_AGE_HOURS", "24"))
+_INVENTORY_REPORT_DIR = re.compile(r"(^|/)\d{4}-\d{2}-\d{2}T\d{2}-\d{2}Z/$")
+
+# Deepest folder level that gets an entry in metrics.json (e.g. data/ctd/May_2026/x/).
+MAX_FOLDER_DEPTH = 4
+
+
+# (divisor, format) for each 1024x step; everything from 1 TiB up is shown in TB
+_SIZE_UNITS = (
+    (1, "{:.0f} B"),
+    (1024, "{:.1f} KB"),
+    (1024 ** 2, "{:.1f} MB"),
+    (1024 ** 3, "{:.2f} GB"),
+    (1024 ** 4, "{:.2f} TB"),
+)
 
 
 def format_size(size_bytes):
     """Format bytes to human readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    # bit_length picks the unit without comparing against each threshold
+    divisor, fmt = _SIZE_UNITS[min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)]
+    return fmt.format(size_bytes / divisor)
 
 
-def get_folder_stats(prefix):
-    """Calculate total size and file count for a folder."""
-    paginator = S3_CLIENT.get_paginator("list_objects_v2")
-    total_size = 0
-    file_count = 0
-    latest_modified_all = None
-    latest_modified_display = None
+def _latest(a, b):
+    """Return the later of two optional datetimes."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
 
-    try:
-        for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                total_size += obj.get("Size", 0)
-                file_count += 1
-                lm = obj["LastModified"]
-                if latest_modified_all is None or lm > latest_modified_all:
-                    latest_modified_all = lm
-                if not exclude_key_for_folder_modified_date(prefix, key):
-                    if latest_modified_display is None or lm > latest_modified_display:
-                        latest_modified_display = lm
-    except Exception as e:
-        print(f"Error processing {prefix}: {e}")
-        return None
 
-    chosen_modified = latest_modified_display or latest_modified_all
+@dataclass(slots=True)
+class DirectoryTotals:
+    """Running totals for the files directly inside one directory."""
+    size: int = 0
+    file_count: int = 0
+    latest_all: datetime | None = None
+    latest_files: datetime | None = None
+    latest_placeholder: datetime | None = None
+
+
+@dataclass(slots=True)
+class FolderTotals:
+    """Running totals for a folder and everything below it."""
+    size: int = 0
+    file_count: int = 0
+    latest_all: datetime | None = None
+    latest_display: datetime | None = None
+
+
+def aggregate_objects(objects, directories):
+    """
+    Fold S3 objects into running totals for the directory that directly holds them.
+
+    Only the object's own directory is touched here; rollup_directories later
+    adds each directory to its ancestor folders once, so per-object work stays
+    constant however deep the key is.
+    """
+    for obj in objects:
+        key = obj["Key"]
+        size = obj.get("Size", 0)
+        lm = obj["LastModified"]
+        cut = key.rfind("/") + 1
+        if not cut:
+            continue  # Bucket-root files belong to no folder
+        directory = directories.get(key[:cut])
+        if directory is None:
+            directory = directories[key[:cut]] = DirectoryTotals()
+        directory.size += size
+        directory.file_count += 1
+        if directory.latest_all is None or lm > directory.latest_all:
+            directory.latest_all = lm
+        name = key[cut:]
+        if not name:
+            # The placeholder key itself ("a/b/") dates only the folders above it
+            if directory.latest_placeholder is None or lm > directory.latest_placeholder:
+                directory.latest_placeholder = lm
+        elif not is_excluded_segment(name):
+            if directory.latest_files is None or lm > directory.latest_files:
+                directory.latest_files = lm
+    return directories
+
+
+def rollup_directories(directories, max_depth=MAX_FOLDER_DEPTH):
+    """
+    Sum per-directory totals into every folder up to max_depth levels that contains them.
+
+    Folders that have an excluded segment (source_data, transform_*) between
+    them and a directory do not take that directory's modified time.
+    """
+    totals = {}
+    for path, directory in directories.items():
+        parts = path.split("/")
+        display_depth = modified_date_min_depth(parts)
+        prefix = ""
+        for depth, part in enumerate(parts[:-1][:max_depth], 1):
+            prefix += part + "/"
+            folder = totals.get(prefix)
+            if folder is None:
+                folder = totals[prefix] = FolderTotals()
+            folder.size += directory.size
+            folder.file_count += directory.file_count
+            folder.latest_all = _latest(folder.latest_all, directory.latest_all)
+            if depth < display_depth:
+                continue
+            folder.latest_display = _latest(folder.latest_display, directory.latest_files)
+            if len(prefix) < len(path) - 1:
+                folder.latest_display = _latest(folder.latest_display, directory.latest_placeholder)
+    return totals
+
+
+def folder_stats(folder):
+    """Convert running folder totals into the metrics.json entry."""
+    chosen_modified = folder.latest_display or folder.latest_all
 
     return {
-        "size": total_size,
-        "size_display": format_size(total_size),
-        "file_count": file_count,
-        "modified": chosen_modified.strftime("%Y-%m-%d %H:%M") if chosen_modified else "-"
+        "size": folder.size,
+        "size_display": format_size(folder.size),
+        "file_count": folder.file_count,
+        # isoformat skips strftime's locale handling; [:16] drops any UTC offset
+        "modified": chosen_modified.isoformat(sep=" ", timespec="minutes")[:16] if chosen_modified else "-"
     }
 
 
-def discover_all_folders(max_depth=4):
-    """Discover all folders in the bucket up to max_depth levels."""
-    folders_to_process = [""]  # Start with root
-    all_folders = set()
+def scan_prefix(prefix):
+    """List every object under prefix once and return per-directory totals."""
+    directories = {}
+    paginator = S3_CLIENT.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix, PaginationConfig=LIST_PAGINATION):
+        aggregate_objects(page.get("Contents", []), directories)
+    return directories
 
-    while folders_to_process:
-        prefix = folders_to_process.pop(0)
-        depth = prefix.count("/")
 
-        if depth >= max_depth:
-            continue
+def split_prefix(prefix):
+    """List one level of prefix: return its subfolders and totals for the files directly in it."""
+    subfolders = []
+    directories = {}
+    paginator = S3_CLIENT.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=BUCKET_NAME, Prefix=prefix, Delimiter="/", PaginationConfig=LIST_PAGINATION
+    ):
+        subfolders.extend(prefix_obj["Prefix"] for prefix_obj in page.get("CommonPrefixes", []))
+        aggregate_objects(page.get("Contents", []), directories)
+    return subfolders, directories
+
 
-        try:
-            paginator = S3_CLIENT.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix, Delimiter="/"):
-                # Get subfolders
-                for prefix_obj in page.get("CommonPrefixes", []):
-                    folder_path = prefix_obj["Prefix"]
+def _list_subfolders(prefix, bucket=BUCKET_NAME):
+    """Return the immediate subfolder prefixes under prefix."""
+    subfolders = []
+    paginator = S3_CLIENT.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=bucket, Prefix=prefix, Delimiter="/", PaginationConfig=LIST_PAGINATION
+    ):
+        for prefix_obj in page.get("CommonPrefixes", []):
+            subfolders.append(prefix_obj["Prefix"])
+    return subfolders
+
+
+def discover_all_folders(max_depth=MAX_FOLDER_DEPTH):
+    """Discover all folders in the bucket up to max_depth levels.
+
+    Every delimited listing is an independent request, so each finished listing
+    immediately queues its subfolders on the pool and sibling prefixes are
+    walked in parallel instead of one at a time.
+    """
+    all_folders = set()
+
+    with ThreadPoolExecutor(max_workers=METRICS_WORKERS) as pool:
+        pending = {pool.submit(_list_subfolders, ""): ""}  # Start with root
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prefix = pending.pop(future)
+                try:
+                    subfolders = future.result()
+                except Exception as e:
+                    print(f"Error discovering folders in {prefix}: {e}")
+                    continue
+
+                for folder_path in subfolders:
                     all_folders.add(folder_path)
-                    folders_to_process.append(folder_path)
-        except Exception as e:
-            print(f"Error discovering folders in {prefix}: {e}")
-            continue
+                    if folder_path.count("/") < max_depth:
+                        pending[pool.submit(_list_subfolders, folder_path)] = folder_path
 
     return sorted(all_folders)
 
 
+def scan_bucket():
+    """List the bucket and return totals for every folder up to MAX_FOLDER_DEPTH."""
+    # Each shard is listed recursively exactly once and shards never overlap,
+    # so their per-directory totals merge by plain update and roll up once.
+    print("Discovering top-level folders...")
+    shards = discover_all_folders(max_depth=1)
+    print(f"Found {len(shards)} top-level folders")
+
+    directories = {}
+    failed = []
+    print(f"Using {METRICS_WORKERS} workers")
+    with ThreadPoolExecutor(max_workers=METRICS_WORKERS) as pool:
+        if len(shards) < METRICS_WORKERS:
+            # Too few top-level folders to keep the pool busy (and one deep folder
+            # would dominate), so shard on their subfolders instead.
+            futures = {pool.submit(split_prefix, shard): shard for shard in shards}
+            shards = []
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    subfolders, shard_directories = future.result()
+                except Exception as e:
+                    print(f"Error splitting {shard}: {e}")
+                    shards.append(shard)  # Scan it whole instead
+                    continue
+                directories.update(shard_directories)
+                shards.extend(subfolders)
+            print(f"Split into {len(shards)} second-level folders")
+
+        total = len(shards)
+        futures = {pool.submit(scan_prefix, shard): shard for shard in shards}
+        for idx, future in enumerate(as_completed(futures), 1):
+            shard = futures[future]
+            try:
+                shard_directories = future.result()
+            except Exception as e:
+                print(f"Error processing {shard}: {e}")
+                failed.append(shard)
+                continue
+            directories.update(shard_directories)
+            print(f"[{idx}/{total}] Scanned: {shard} ({len(shard_directories)} directories)")
+
+    totals = rollup_directories(directories)
+    for shard in failed:
+        # A folder holding a failed shard would be undercounted: leave it out of
+        # metrics.json, so the web server computes its stats live instead. Its
+        # other subfolders keep their entries, and it is still listed one level
+        # at a time from them
+        prefix = ""
+        for part in shard.split("/")[:-1]:
+            prefix += part + "/"
+            totals.pop(prefix, None)
+    if failed:
+        print(f"Left out {len(failed)} failed folders and the folders above them")
+    return totals
+
+
+def _latest_inventory_manifest():
+    """Return (bucket, manifest) for the newest report under INVENTORY_LOCATION, or None."""
+    bucket, _, prefix = INVENTORY_LOCATION.removeprefix("s3://").partition("/")
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    reports = [p for p in _list_subfolders(prefix, bucket=bucket) if _INVENTORY_REPORT_DIR.search(p)]
+    if not reports:
+        return None
+    response = S3_CLIENT.get_object(Bucket=bucket, Key=max(reports) + "manifest.json")
+    return bucket, orjson.loads(response["Body"].read())
+
+
+def iter_inventory_objects(bucket, manifest):
+    """Yield S3-style object dicts from the gzipped CSV files of an inventory report."""
+    columns = [name.strip() for name in manifest["fileSchema"].split(",")]
+    key_idx = columns.index("Key")
+    size_idx = columns.index("Size")
+    modified_idx = columns.index("LastModifiedDate")
+    # Versioned inventories also list noncurrent versions and delete markers
+    latest_idx = columns.index("IsLatest") if "IsLatest" in columns else None
+    marker_idx = columns.index("IsDeleteMarker") if "IsDeleteMarker" in columns else None
+
+    for data_file in manifest["files"]:
+        response = S3_CLIENT.get_object(Bucket=bucket, Key=data_file["key"])
+        with gzip.open(response["Body"], "rt", newline="") as f:
+            for row in csv.reader(f):
+                if latest_idx is not None and row[latest_idx] != "true":
+                    continue
+                if marker_idx is not None and row[marker_idx] == "true":
+                    continue
+                yield {
+                    # CSV inventories URL-encode keys
+                    "Key": unquote_plus(row[key_idx]),
+                    "Size": int(row[size_idx] or 0),
+                    "LastModified": datetime.fromisoformat(row[modified_idx]),
+                }
+
+
+def load_inventory_totals():
+    """
+    Return folder totals built from the latest S3 Inventory report.
+
+    Returns None when no inventory is configured or the newest report is
+    missing, older than INVENTORY_MAX_AGE_HOURS, not CSV, or unreadable; the
+    caller then lists the bucket instead.
+    """
+    if not INVENTORY_LOCATION:
+        return None
+
+    try:
+        found = _latest_inventory_manifest()
+        if found is None:
+            print(f"No inventory report found under {INVENTORY_LOCATION}")
+            return None
+        bucket, manifest = found
+
+        created = datetime.fromtimestamp(int(manifest["creationTimestamp"]) / 1000, tz=timezone.utc)
+        age_hours = (datetime.now(timezone.utc) - created).total_seconds() / 3600
+        if age_hours > INVENTORY_MAX_AGE_HOURS:
+            print(f"Inventory report is {age_hours:.1f} hours old (limit {INVENTORY_MAX_AGE_HOURS:g})")
+            return None
+        if manifest.get("fileFormat") != "CSV":
+            print(f"Inventory format {manifest.get('fileFormat')} is not supported (use CSV)")
+            return None
+
+        print(f"Reading inventory report from {created:%Y-%m-%d %H:%M} UTC ({len(manifest['files'])} files)")
+        return rollup_directories(aggregate_objects(iter_inventory_objects(bucket, manifest), {}))
+    except Exception as e:
+        print(f"Error reading inventory report: {e}")
+        return None
+
+
 def _list_metrics_archives(parent: Path) -> list[Path]:
     """Return timestamped metrics snapshot paths, newest first."""
     found: list[Path] = []
@@ -124,7 +395,7 @@ def archive_and_prune_metrics() -> Path | None:
         return None
 
     stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    archive_path = METRICS_FILE.parent / f"metrics-{stamp}.json"
+    archive_path = METRICS_FILE.parent / f"metrics-{stamp}.json{'.zst' if METRICS_COMPRESSED else ''}"
     shutil.copy2(METRICS_FILE, archive_path)
 
     parent = METRICS_FILE.parent
@@ -140,40 +411,38 @@ def compute_all_metrics():
     print(f"Starting metric computation at {datetime.now()}")
     print(f"Bucket: {BUCKET_NAME}")
 
-    # Discover all folders
-    print("Discovering folders...")
-    folders = discover_all_folders()
-    print(f"Found {len(folders)} folders to process")
-
-    # Compute metrics for each folder
-    metrics = {}
-    total = len(folders)
-
-    for idx, folder in enumerate(folders, 1):
-        print(f"[{idx}/{total}] Processing: {folder}")
-        stats = get_folder_stats(folder)
-        if stats:
-            metrics[folder] = stats
+    totals = load_inventory_totals()
+    source = "inventory"
+    if totals is None:
+        print("Listing bucket...")
+        totals = scan_bucket()
+        source = "listing"
 
-        # Progress update every 10 folders
-        if idx % 10 == 0:
-            print(f"Progress: {idx}/{total} ({idx/total*100:.1f}%)")
+    metrics = {folder: folder_stats(totals[folder]) for folder in sorted(totals)}
 
     # Add metadata
     output = {
         "computed_at": datetime.now().isoformat(),
         "bucket": BUCKET_NAME,
+        "source": source,
         "folder_count": len(metrics),
         "metrics": metrics
     }
 
     # Save to JSON file (atomic write)
     temp_file = METRICS_FILE.with_suffix(".tmp")
-    with open(temp_file, "w") as f:
-        json.dump(output, f, indent=2)
-
-    # Atomic rename
-    temp_file.replace(METRICS_FILE)
+    if METRICS_COMPRESSED:
+        payload = zstandard.ZstdCompressor(level=10).compress(orjson.dumps(output))
+    else:
+        payload = orjson.dumps(output, option=orjson.OPT_INDENT_2)
+    with open(temp_file, "wb") as f:
+        f.write(payload)
+        # On disk before the rename, so a crash never leaves a renamed but empty file
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Atomic rename: the web server's reload sees either the old file or the new one
+    os.replace(temp_file, METRICS_FILE)
 
     archived = archive_and_prune_metrics()
     if archived:
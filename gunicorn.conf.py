@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the KGX Storage web server.
+
+Gunicorn reads this file from the working directory; flags on the command
+line (e.g. --workers in the systemd unit) still take precedence.
+"""
+
+import multiprocessing
+import os
+
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+# gevent: each worker serves many requests at once while they wait on S3
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+keepalive = 65
+
+# Import the app once in the master: templates, the rendered docs page and its
+# compressed variants are built a single time and shared with forked workers.
+# GEVENT_MONKEY_PATCH=1 makes web_server patch sockets before boto3 loads.
+# HUP re-forks workers from that same imported code, so deploying new code
+# takes a restart of the service.
+preload_app = True
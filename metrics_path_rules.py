@@ -13,6 +13,11 @@ from __future__ import annotations
 _MODIFIED_EXCLUDE_EXACT: frozenset[str] = frozenset({"source_data"})
 
 
+def is_excluded_segment(segment: str) -> bool:
+    """True if a path segment marks pipeline churn (source_data, transform_*)."""
+    return segment in _MODIFIED_EXCLUDE_EXACT or segment.startswith("transform_")
+
+
 def exclude_key_for_folder_modified_date(prefix: str, key: str) -> bool:
     """
     Return True if this object should not set the folder's displayed modified time.
@@ -29,8 +34,22 @@ def exclude_key_for_folder_modified_date(prefix: str, key: str) -> bool:
     for segment in rel.split("/"):
         if not segment:
             continue
-        if segment in _MODIFIED_EXCLUDE_EXACT:
-            return True
-        if segment.startswith("transform_"):
+        if is_excluded_segment(segment):
             return True
     return False
+
+
+def modified_date_min_depth(parts: list[str]) -> int:
+    """
+    Return the shallowest folder depth whose modified time a key may set.
+
+    parts is key.split("/"). A key is excluded for a folder when any segment
+    below that folder is excluded, so it only counts for folders at or below
+    its last excluded segment (depth 0 when nothing is excluded). Equivalent to
+    exclude_key_for_folder_modified_date for every non-placeholder ancestor,
+    without re-splitting the key once per ancestor.
+    """
+    for depth in range(len(parts), 0, -1):
+        if parts[depth - 1] and is_excluded_segment(parts[depth - 1]):
+            return depth
+    return 0
@@ -0,0 +1,12 @@
+// Clipboard helper shared by the docs page and the JSON viewer.
+(function () {
+    // Copy text and mark el as copied for two seconds (each page styles .copied)
+    window.kgxCopy = function (el, text) {
+        return navigator.clipboard.writeText(text).then(() => {
+            el.classList.add('copied');
+            setTimeout(() => el.classList.remove('copied'), 2000);
+        }).catch(() => {
+            alert('Failed to copy to clipboard');
+        });
+    };
+})();
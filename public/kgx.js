@@ -0,0 +1,97 @@
+// Folder links load /api/list/<path> and redraw the listing in place, so moving
+// between folders fetches a small JSON document instead of a whole page.
+// The links are ordinary hrefs, so everything still works without JavaScript.
+function escapeHTML(value) {
+    return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+function renderListing(data) {
+    document.title = (data.path || '/') + ' - Translator Ingests';
+
+    document.getElementById('breadcrumbs').innerHTML =
+        '<a href="/">s3://' + escapeHTML(data.bucket) + '</a>' +
+        data.breadcrumbs.map(crumb =>
+            '/<a href="/' + escapeHTML(crumb.path) + '">' + escapeHTML(crumb.name) + '</a>'
+        ).join('');
+
+    let toolbar = '';
+    if (data.parent !== null) {
+        toolbar += '<a href="/' + escapeHTML(data.parent) + '" class="back-btn"><span>&#8592;</span> Back</a> ';
+    }
+    toolbar += '<div class="stats-bar">' +
+        '<span>' + data.folder_count + ' folders</span> ' +
+        '<span>' + data.file_count + ' files</span> ' +
+        '<span>' + escapeHTML(data.total_size) + ' total</span></div>';
+    document.getElementById('toolbar').innerHTML = toolbar;
+
+    document.getElementById('notice').innerHTML = data.show_translator_kg_notice
+        ? '<div class="info-banner"><strong>Internal use only.</strong> ' +
+          'This merged knowledge graph is for NCATS Translator internal use and must not be distributed. ' +
+          'To download the publicly shareable merged graph, visit ' +
+          '<a href="' + escapeHTML(data.translator_kg_open_url) + '">translator_kg_open</a>.</div>'
+        : '';
+
+    const rows = [];
+    if (!data.folders.length && !data.files.length) {
+        rows.push('<div class="empty"><div class="empty-icon">&#128193;</div><p>This folder is empty</p></div>');
+    }
+    if (data.folders.length) {
+        rows.push('<div class="section-label">Folders</div>');
+        for (const folder of data.folders) {
+            rows.push('<a href="/' + escapeHTML(folder.path) + '" class="tree-item">' +
+                '<span class="tree-name"><span class="tree-icon folder">&#128193;</span> ' + escapeHTML(folder.name) + '</span> ' +
+                '<span class="tree-size">' + escapeHTML(folder.size_display) + '</span> ' +
+                '<span class="tree-count">' + folder.file_count + ' files</span> ' +
+                '<span class="tree-date">' + escapeHTML(folder.modified) + '</span></a>');
+        }
+    }
+    if (data.files.length) {
+        rows.push('<div class="section-label">Files</div>');
+        for (const file of data.files) {
+            const href = '/' + escapeHTML(file.path);
+            const view = file.is_json
+                ? ' <a href="' + escapeHTML(file.view_url) + '" class="tree-action">View</a>'
+                : '';
+            rows.push('<div class="tree-item"><span class="tree-name">' +
+                '<a href="' + href + '" class="tree-name-link"><span class="tree-icon file">&#128196;</span> ' + escapeHTML(file.name) + '</a>' +
+                view + '</span> ' +
+                '<span class="tree-size">' + escapeHTML(file.size_display) + '</span> ' +
+                '<span class="tree-count">-</span> ' +
+                '<span class="tree-date">' + escapeHTML(file.modified) + '</span></div>');
+        }
+    }
+    document.getElementById('tree-rows').innerHTML = rows.join('');
+}
+
+async function navigate(path, push) {
+    let data;
+    try {
+        const response = await fetch('/api/list/' + path);
+        if (!response.ok) throw new Error('HTTP ' + response.status);
+        data = await response.json();
+    } catch (err) {
+        // Fall back to an ordinary page load
+        window.location.href = '/' + path;
+        return;
+    }
+    renderListing(data);
+    if (push) {
+        history.pushState(null, '', '/' + path);
+        window.scrollTo(0, 0);
+    }
+}
+
+document.addEventListener('click', event => {
+    if (event.defaultPrevented || event.button !== 0 ||
+        event.metaKey || event.ctrlKey || event.shiftKey || event.altKey) return;
+    const link = event.target.closest('a');
+    if (!link || link.target || link.origin !== window.location.origin) return;
+    // Only the root and folder URLs (ending in /) are listings
+    const path = link.pathname.slice(1);
+    if (link.search || link.hash || (path && !path.endsWith('/'))) return;
+    event.preventDefault();
+    navigate(path, true);
+});
+
+window.addEventListener('popstate', () => navigate(window.location.pathname.slice(1), false));
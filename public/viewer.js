@@ -0,0 +1,142 @@
+// JSON viewer: the page arrives without the document; fetch it, indent it and colour it here.
+(function () {
+    const code = document.getElementById('json-code');
+    const copyButton = document.getElementById('copy-json');
+    // The indented text as loaded; Copy uses it instead of reading it back out of the spans
+    let copyText = null;
+    // The text is coloured in pieces of about this many characters, each as it scrolls into view
+    const CHUNK_CHARS = 50000;
+    // One alternative per token kind; a string followed by a colon is a key.
+    // A string may be cut off by a truncated preview, hence the optional closing quote.
+    const TOKEN = /("(?:[^"\\]|\\.)*"?)(\s*:)?|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|\b(true|false)\b|\b(null)\b/g;
+    const STRUCTURAL = ',:{}[]" \n\r\t';
+
+    function escapeHTML(s) {
+        return s.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    }
+
+    // Re-indent with two spaces, copying strings and numbers exactly as sent (no
+    // JSON.parse, so big integers keep every digit). Works on a truncated prefix too.
+    function indentJSON(text) {
+        const out = [];
+        const n = text.length;
+        let depth = 0;
+        let i = 0;
+        const newline = () => '\n' + '  '.repeat(depth);
+        while (i < n) {
+            const c = text[i];
+            if (c === '"') {
+                let j = i + 1;
+                while (j < n && text[j] !== '"') j += text[j] === '\\' ? 2 : 1;
+                out.push(text.slice(i, j + 1));
+                i = j + 1;
+                continue;
+            }
+            if (c === '{' || c === '[') {
+                let j = i + 1;
+                while (j < n && ' \n\r\t'.includes(text[j])) j++;
+                if (text[j] === (c === '{' ? '}' : ']')) {
+                    out.push(c + text[j]);
+                    i = j + 1;
+                    continue;
+                }
+                depth++;
+                out.push(c + newline());
+            } else if (c === '}' || c === ']') {
+                depth = Math.max(depth - 1, 0);
+                out.push(newline() + c);
+            } else if (c === ',') {
+                out.push(',' + newline());
+            } else if (c === ':') {
+                out.push(': ');
+            } else if (!STRUCTURAL.includes(c)) {
+                let j = i;
+                while (j < n && !STRUCTURAL.includes(text[j])) j++;
+                out.push(text.slice(i, j));
+                i = j;
+                continue;
+            }
+            i++;
+        }
+        return out.join('');
+    }
+
+    // Wrap tokens in json-* spans in one pass, escaping everything else
+    function highlightJSON(text) {
+        const parts = [];
+        let pos = 0;
+        let m;
+        TOKEN.lastIndex = 0;
+        while ((m = TOKEN.exec(text)) !== null) {
+            parts.push(escapeHTML(text.slice(pos, m.index)));
+            if (m[1] !== undefined) {
+                parts.push('<span class="json-' + (m[2] ? 'key' : 'string') + '">' + escapeHTML(m[1]) + '</span>');
+                if (m[2]) parts.push(m[2]);
+            } else if (m[3] !== undefined) {
+                parts.push('<span class="json-number">' + m[3] + '</span>');
+            } else if (m[4] !== undefined) {
+                parts.push('<span class="json-boolean">' + m[4] + '</span>');
+            } else {
+                parts.push('<span class="json-null">' + m[5] + '</span>');
+            }
+            pos = TOKEN.lastIndex;
+        }
+        parts.push(escapeHTML(text.slice(pos)));
+        return parts.join('');
+    }
+
+    // Cut at line breaks: indentJSON never puts a line break inside a token, so
+    // each piece highlights exactly as it would as part of the whole
+    function splitChunks(text) {
+        const chunks = [];
+        let start = 0;
+        while (start < text.length) {
+            let end = text.indexOf('\n', start + CHUNK_CHARS);
+            if (end === -1) end = text.length;
+            chunks.push(text.slice(start, end));
+            start = end;
+        }
+        return chunks;
+    }
+
+    // Show the text plain at once and colour each piece when it nears the
+    // visible part of the scroll box, so a large file costs only what is looked at
+    function render(text) {
+        copyText = text;
+        copyButton.disabled = false;
+        const observer = new IntersectionObserver(entries => {
+            for (const entry of entries) {
+                if (!entry.isIntersecting) continue;
+                observer.unobserve(entry.target);
+                entry.target.innerHTML = highlightJSON(entry.target.textContent);
+            }
+        }, { root: code.closest('.json-content'), rootMargin: '2000px 0px' });
+        const pieces = document.createDocumentFragment();
+        for (const chunk of splitChunks(text)) {
+            const span = document.createElement('span');
+            span.textContent = chunk;
+            pieces.appendChild(span);
+            observer.observe(span);
+        }
+        code.replaceChildren(pieces);
+    }
+
+    copyButton.addEventListener('click', () => kgxCopy(copyButton, copyText));
+
+    const headers = {};
+    if (code.dataset.previewBytes) {
+        // Only the part the viewer shows; the rest stays on the server
+        headers.Range = 'bytes=0-' + (Number(code.dataset.previewBytes) - 1);
+    }
+    fetch(code.dataset.src, { headers: headers })
+        .then(response => {
+            if (!response.ok) throw new Error('HTTP ' + response.status);
+            return response.arrayBuffer();
+        })
+        // stream: true holds back a character the preview's byte range cut in two,
+        // instead of decoding its first bytes as U+FFFD
+        .then(bytes => render(indentJSON(new TextDecoder().decode(bytes, { stream: true }))))
+        .catch(err => {
+            code.textContent = 'Could not load the file (' + err.message + ').';
+        });
+})();
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Render the most visited folder pages to static HTML for Nginx to serve.
+
+The root listing and the folders near it change only when new data lands, so
+update_metrics.sh runs this right after compute_metrics.py. Each page is
+rendered by the web app itself (through Flask's test client, no server needed)
+and written to PAGE_CACHE_DIR/<folder>/index.html. Nginx serves those files for
+plain requests and sends everything else (deeper folders, ?refresh=true,
+files) to the app. ?refresh=true also deletes the folder's file, and a page
+still showing "-" for some folder's stats is not written at all.
+
+Usage:
+    python render_cache.py
+"""
+
+import os
+import shutil
+import time
+
+import web_server
+
+# Shared with the app, which deletes a page here on ?refresh=true
+PAGE_CACHE_DIR = web_server.PAGE_CACHE_DIR
+# Folder depth rendered: 0 is only the root page, 1 adds the top-level folders, ...
+PAGE_CACHE_DEPTH = int(os.environ.get("PAGE_CACHE_DEPTH", "1"))
+
+
+def cached_folders():
+    """Root plus every folder down to PAGE_CACHE_DEPTH, from the app's own listings."""
+    folders = [""]
+    level = [""]
+    for _ in range(PAGE_CACHE_DEPTH):
+        level = [folder.path for prefix in level for folder in web_server.list_directory(prefix)[0]]
+        folders.extend(level)
+    return folders
+
+
+def render_page(client, folder):
+    """The app's response for folder, asked again once if some stats were still "-"."""
+    resp = client.get("/" + folder)
+    if resp.headers.get("Cache-Control") == web_server.PARTIAL_PAGE_CACHE_CONTROL:
+        # The live listings behind them stop within LIVE_STATS_TIMEOUT, and the
+        # app keeps their results for the next request
+        time.sleep(web_server.LIVE_STATS_TIMEOUT)
+        resp = client.get("/" + folder)
+    return resp
+
+
+def render_cache():
+    """Render each cached folder into a fresh directory, then swap it in."""
+    staging = PAGE_CACHE_DIR.with_name(PAGE_CACHE_DIR.name + ".new")
+    shutil.rmtree(staging, ignore_errors=True)
+    client = web_server.app.test_client()
+    rendered = 0
+    for folder in cached_folders():
+        resp = render_page(client, folder)
+        if resp.status_code != 200:
+            print(f"Skipping /{folder}: HTTP {resp.status_code}")
+            continue
+        if resp.headers.get("Cache-Control") == web_server.PARTIAL_PAGE_CACHE_CONTROL:
+            # Left to the app, which lists it with whatever stats are ready then
+            print(f"Skipping /{folder}: some folder stats are unavailable")
+            continue
+        target = staging / folder / "index.html"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(resp.get_data())
+        rendered += 1
+
+    # Swap directories so Nginx never sees a half-written cache
+    old = PAGE_CACHE_DIR.with_name(PAGE_CACHE_DIR.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if PAGE_CACHE_DIR.exists():
+        os.replace(PAGE_CACHE_DIR, old)
+    os.replace(staging, PAGE_CACHE_DIR)
+    shutil.rmtree(old, ignore_errors=True)
+    print(f"Rendered {rendered} pages to {PAGE_CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    render_cache()
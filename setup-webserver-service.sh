@@ -36,6 +36,7 @@ fi
 SERVICE_NAME="kgx-storage-webserver"
 SERVICE_FILE="/etc/systemd/system/${SERVICE_NAME}.service"
 LOG_DIR="/var/log/kgx-storage"
+CACHE_DIR="/var/cache/kgx-storage"
 WEBSERVER_DIR="/home/ubuntu/kgx-storage-webserver"
 PROJECT_DIR="/home/ubuntu/translator-ingests"
 VENV_DIR="${PROJECT_DIR}/.venv"
@@ -43,19 +44,25 @@ UV_BIN="/home/ubuntu/.local/bin/uv"
 
 echo_info "Setting up KGX Storage web server as systemd service..."
 
-# Step 1: Create log directory
+# Step 1: Create log and page cache directories
 echo_info "Creating log directory: ${LOG_DIR}"
 mkdir -p "${LOG_DIR}"
 chown ubuntu:ubuntu "${LOG_DIR}"
 chmod 755 "${LOG_DIR}"
 
-# Step 2: Install gunicorn if not present
-echo_info "Checking for gunicorn..."
-if [ -f "${VENV_DIR}/bin/gunicorn" ]; then
-    echo_info "gunicorn already installed"
+# Prerendered pages (render_cache.py) live here; the service deletes them on ?refresh=true
+echo_info "Creating page cache directory: ${CACHE_DIR}"
+mkdir -p "${CACHE_DIR}"
+chown ubuntu:ubuntu "${CACHE_DIR}"
+chmod 755 "${CACHE_DIR}"
+
+# Step 2: Install gunicorn and its gevent workers if not present
+echo_info "Checking for gunicorn and gevent..."
+if [ -f "${VENV_DIR}/bin/gunicorn" ] && "${VENV_DIR}/bin/python" -c "import gevent" 2>/dev/null; then
+    echo_info "gunicorn and gevent already installed"
 else
-    echo_info "Installing gunicorn..."
-    sudo -u ubuntu bash -c "cd ${PROJECT_DIR} && ${UV_BIN} pip install gunicorn"
+    echo_info "Installing gunicorn and gevent..."
+    sudo -u ubuntu bash -c "cd ${PROJECT_DIR} && ${UV_BIN} pip install gunicorn gevent"
 fi
 
 # Step 3: Copy service file to systemd directory
@@ -1,25 +1,41 @@
 #!/bin/bash
-# Update KGX Storage metrics and reload web server workers
-# Run hourly via cron to keep folder statistics fresh
+# Update KGX Storage metrics and the prerendered folder pages
+# Run hourly via cron to keep folder statistics fresh. Workers pick up the new
+# metrics.json on their own within a minute (see refresh_metrics in web_server.py)
+
+# Stop at the first failing step; a pipe fails if compute_metrics.py does, not only tee
+set -eo pipefail
 
 cd /home/ubuntu/kgx-storage-webserver
 
 METRICS_LOG=/var/log/kgx-storage/metrics.log
 VENV_PY=/home/ubuntu/kgx-storage-webserver/.venv/bin/python
+# Same as in kgx-storage-webserver.service: the app deletes pages there on ?refresh=true
+export PAGE_CACHE_DIR=/var/cache/kgx-storage/page-cache
 
-# Compute new metrics: always append to log; mirror to terminal when run interactively
+# Compute new metrics: always append to log; mirror to terminal when run interactively.
+# On failure keep the old metrics.json and page cache, and don't report an update
 if [ -t 1 ]; then
-  set -o pipefail
-  "$VENV_PY" -u compute_metrics.py 2>&1 | tee -a "$METRICS_LOG"
+  "$VENV_PY" -u compute_metrics.py 2>&1 | tee -a "$METRICS_LOG" || {
+    echo "[$(date)] compute_metrics.py failed; metrics and page cache left as they were" | tee -a "$METRICS_LOG"
+    exit 1
+  }
 else
-  "$VENV_PY" -u compute_metrics.py >> "$METRICS_LOG" 2>&1
+  "$VENV_PY" -u compute_metrics.py >> "$METRICS_LOG" 2>&1 || {
+    echo "[$(date)] compute_metrics.py failed; metrics and page cache left as they were" >> "$METRICS_LOG"
+    exit 1
+  }
 fi
 
-# Reload gunicorn workers gracefully (HUP signal)
-pkill -HUP -f "gunicorn.*web_server:app" 2>&1 | logger -t kgx-metrics
+# Prerender the root and top-level folder pages from the new metrics for Nginx
+if [ -t 1 ]; then
+  "$VENV_PY" -u render_cache.py 2>&1 | tee -a "$METRICS_LOG"
+else
+  "$VENV_PY" -u render_cache.py >> "$METRICS_LOG" 2>&1
+fi
 
 if [ -t 1 ]; then
-  echo "[$(date)] Metrics updated and workers reloaded" | tee -a "$METRICS_LOG"
+  echo "[$(date)] Metrics and page cache updated" | tee -a "$METRICS_LOG"
 else
-  echo "[$(date)] Metrics updated and workers reloaded" >> "$METRICS_LOG"
+  echo "[$(date)] Metrics and page cache updated" >> "$METRICS_LOG"
 fi
@@ -2,51 +2,274 @@
 Web server for browsing and downloading S3 bucket contents.
 
 Run this on the EC2 instance to serve files via https://kgx-storage.ci.transltr.io
+under gunicorn with gevent workers (see kgx-storage-webserver.service and the
+Dockerfile); `python web_server.py` starts Flask's single-threaded dev server.
 """
 
-import boto3
-import json
 import os
+
+if os.environ.get("GEVENT_MONKEY_PATCH") == "1":
+    # Make sockets cooperative before boto3/urllib3 are imported, so S3 calls
+    # yield to other requests even when the app is loaded before the workers fork
+    from gevent import monkey
+    monkey.patch_all()
+
+import boto3
+import brotli
+import gzip
+import hashlib
+import mmap
+import orjson
+import threading
+import time
+import zstandard
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
 from datetime import timezone
-from flask import Flask, render_template_string, request, redirect, send_from_directory, Response
+from flask import Flask, request, redirect, send_from_directory, Response
+from flask_compress import Compress
 from botocore import UNSIGNED
 from botocore.config import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
+from werkzeug.http import is_resource_modified
 from pathlib import Path
+from urllib.parse import quote
 
 from metrics_path_rules import exclude_key_for_folder_modified_date
 
 app = Flask(__name__)
+# Listing and viewer pages are repetitive text; brotli (or gzip) shrinks them several times over
+app.config.update(
+    COMPRESS_MIMETYPES=["text/html", "application/json", "text/css", "application/javascript"],
+    COMPRESS_ALGORITHM=["br", "gzip", "deflate"],
+    COMPRESS_BR_LEVEL=6,
+    COMPRESS_LEVEL=5,
+    COMPRESS_MIN_SIZE=500,
+    # Streamed bodies (S3 files passed through) would be read whole into memory to
+    # compress; they go out as they arrive instead
+    COMPRESS_STREAMS=False,
+    # Registered below through compress_response, which skips partial content
+    COMPRESS_REGISTER=False,
+    # Templates are strings compiled once at import; nothing on disk to watch
+    TEMPLATES_AUTO_RELOAD=False,
+)
+compress = Compress(app)
+
+
+@app.after_request
+def compress_response(response):
+    """Compress the response unless it is a byte range.
+
+    A 206's Content-Range counts identity bytes: encoding the body would make
+    resumed downloads and the viewer's preview request splice in the wrong data.
+    """
+    if response.status_code == 206 or "Content-Range" in response.headers:
+        return response
+    return compress.after_request(response)
+
+
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "kgx-translator-ingests")
 SITE_URL = os.environ.get("SITE_URL", "https://kgx-storage.ci.transltr.io")
-S3_CLIENT = boto3.client("s3")
+# Optional CDN (e.g. CloudFront with the bucket as origin) that downloads redirect to
+# instead of presigned S3 URLs, so file bytes come from an edge near the user
+DOWNLOAD_CDN_URL = os.environ.get("DOWNLOAD_CDN_URL", "").rstrip("/")
+# Behind the bundled nginx config, let nginx fetch /stream/ bodies from S3 itself
+# (X-Accel-Redirect to a presigned URL) instead of copying them through Python
+STREAM_X_ACCEL = os.environ.get("STREAM_X_ACCEL") == "1"
 PUBLIC_DIR = Path(__file__).parent / "public"
+# Browsers keep /public files requested with ?v=<hash> for a year
+PUBLIC_VERSIONED_MAX_AGE = 31536000
+# Unversioned ones (favicon, banner) for a day
+PUBLIC_MAX_AGE = 86400
 METRICS_FILE = Path(os.environ.get("METRICS_FILE", Path(__file__).parent / "metrics.json"))
+# Folder pages prerendered by render_cache.py for nginx to serve from disk
+PAGE_CACHE_DIR = Path(os.environ.get("PAGE_CACHE_DIR", Path(__file__).parent / "page-cache"))
 TRANSLATOR_KG_OPEN_PATH = "releases/translator_kg_open"
+# Larger JSON files are shown as a truncated preview of this many bytes in the viewer
+JSON_VIEWER_MAX_BYTES = int(os.environ.get("JSON_VIEWER_MAX_BYTES", "2000000"))
+# Listing, viewer and API responses are the same for every visitor, so a CDN in front
+# (CloudFront) may serve them for a minute; browsers revalidate, which the ETag makes cheap
+PAGE_CACHE_CONTROL = "public, max-age=0, s-maxage=60, must-revalidate"
+# Except while some folder stats still show "-": nothing should keep those
+PARTIAL_PAGE_CACHE_CONTROL = "no-store"
+# The docs page only changes on deploy; after a week browsers revalidate against its ETag
+DOCS_CACHE_CONTROL = "public, max-age=604800, stale-while-revalidate=86400"
+# Download redirects point at short-lived signed URLs
+DOWNLOAD_REDIRECT_CACHE_CONTROL = "private, max-age=300"
+
+
+def _use_anonymous_s3():
+    """True when KGX_ANONYMOUS_S3=1, for buckets with a public-read policy."""
+    return os.environ.get("KGX_ANONYMOUS_S3") == "1"
+
+
+# Concurrent live folder-stat listings per worker (see _STATS_POOL)
+LIVE_STATS_WORKERS = 32
+# Sockets kept open to S3 per worker. A gevent worker runs many requests at once, and
+# a full pool makes urllib3 open, then throw away, a fresh TLS connection per call
+S3_MAX_POOL_CONNECTIONS = max(int(os.environ.get("S3_MAX_POOL_CONNECTIONS", "128")), LIVE_STATS_WORKERS * 2)
+
+# One pooled client shared by all request threads; keepalive avoids TLS reconnects,
+# and the timeouts keep one slow S3 call from holding a worker indefinitely
+S3_CLIENT = boto3.client(
+    "s3",
+    config=Config(
+        signature_version=UNSIGNED if _use_anonymous_s3() else None,
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+        s3={"addressing_style": "virtual"},
+    ),
+)
+# Ask for the most keys list_objects_v2 returns per call
+LIST_MAX_KEYS = 1000
+# Live folder-stat listings for subfolders missing from metrics.json run here concurrently
+_STATS_POOL = ThreadPoolExecutor(max_workers=LIVE_STATS_WORKERS)
+# Listings of the subfolders of one big folder, split up by _live_folder_totals. A pool
+# of its own, since those splits are started from _STATS_POOL tasks waiting on them
+_SPLIT_POOL = ThreadPoolExecutor(max_workers=LIVE_STATS_WORKERS)
+# Seconds a listing waits on those live listings before showing "-" for the rest,
+# and the longest any one of them keeps listing
+LIVE_STATS_TIMEOUT = float(os.environ.get("LIVE_STATS_TIMEOUT", "5"))
+# Keys a live or recursive folder listing counts before it gives up on folder totals
+LIVE_LISTING_MAX_KEYS = int(os.environ.get("LIVE_LISTING_MAX_KEYS", "100000"))
+# Shown for a subfolder whose live listing failed or timed out
+_UNKNOWN_FOLDER_STATS = {"size": 0, "size_display": "-", "file_count": 0, "modified": "-"}
+
+
+class MetricsTable:
+    """Precomputed folder stats as parallel arrays over the sorted folder prefixes.
+
+    Far smaller than the parsed dict of dicts for a large bucket: sizes and
+    counts are packed ints, repeated dates are shared, and size_display is
+    formatted on lookup instead of stored per folder.
+    """
+
+    __slots__ = ("_prefixes", "_sizes", "_file_counts", "_modified")
+
+    def __init__(self, metrics):
+        self._prefixes = sorted(metrics)
+        self._sizes = array("q", (metrics[p]["size"] for p in self._prefixes))
+        self._file_counts = array("q", (metrics[p]["file_count"] for p in self._prefixes))
+        shared = {}
+        self._modified = [shared.setdefault(m, m) for m in (metrics[p]["modified"] for p in self._prefixes)]
+
+    def _index(self, prefix):
+        i = bisect_left(self._prefixes, prefix)
+        if i < len(self._prefixes) and self._prefixes[i] == prefix:
+            return i
+        return -1
+
+    def __contains__(self, prefix):
+        return self._index(prefix) >= 0
+
+    def has_subfolders(self, prefix):
+        """True if any folder below prefix has stats (prefix itself may not)."""
+        i = bisect_left(self._prefixes, prefix)
+        if i < len(self._prefixes) and self._prefixes[i] == prefix:
+            i += 1
+        return i < len(self._prefixes) and self._prefixes[i].startswith(prefix)
+
+    def __len__(self):
+        return len(self._prefixes)
+
+    def get(self, prefix):
+        """Stats for prefix in the metrics.json entry format, or None."""
+        i = self._index(prefix)
+        if i < 0:
+            return None
+        return {
+            "size": self._sizes[i],
+            "size_display": format_size(self._sizes[i]),
+            "file_count": self._file_counts[i],
+            "modified": self._modified[i],
+        }
+
 
 # Load precomputed metrics
-_metrics_data = {}
+_metrics_data = MetricsTable({})
+_metrics_mtime = None
+_metrics_checked_at = 0.0
+# Seconds between checks for a metrics.json rewritten by compute_metrics.py
+METRICS_RELOAD_INTERVAL = int(os.environ.get("METRICS_RELOAD_INTERVAL", "60"))
+
+# Directory listings and rendered directory pages by prefix: prefix -> (expires_at, value)
+_listing_cache = {}
+_page_cache = {}
+LISTING_CACHE_TTL = int(os.environ.get("LISTING_CACHE_TTL", "60"))
+LISTING_CACHE_SIZE = 1024
+# A listing with "-" for stats still being computed is kept only as long as those
+# live listings may run, so the next view picks up their results
+PARTIAL_LISTING_CACHE_TTL = LIVE_STATS_TIMEOUT
+# Held while a cache is resized or swept; live-stat callbacks write from pool threads
+_cache_lock = threading.Lock()
+# Whether a path without trailing slash is a folder: prefix -> (expires_at, bool)
+_prefix_cache = {}
+PREFIX_CACHE_TTL = 10
+# Live folder-stat listings by prefix: prefix -> (expires_at, Future), see _live_folder_stats
+_live_stats_cache = {}
 
 
 def load_metrics():
     """Load precomputed metrics from JSON file."""
-    global _metrics_data
+    global _metrics_data, _metrics_mtime
     try:
         if METRICS_FILE.exists():
-            with open(METRICS_FILE, "r") as f:
-                data = json.load(f)
-                _metrics_data = data.get("metrics", {})
-                print(f"Loaded metrics for {len(_metrics_data)} folders (computed at {data.get('computed_at', 'unknown')})")
+            mtime = METRICS_FILE.stat().st_mtime
+            # Parse straight from the page cache instead of reading a copy first
+            with open(METRICS_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as raw:
+                    if METRICS_FILE.suffix == ".zst":
+                        data = orjson.loads(zstandard.ZstdDecompressor().decompress(raw))
+                    else:
+                        data = orjson.loads(raw)
+            _metrics_data = MetricsTable(data.get("metrics", {}))
+            _metrics_mtime = mtime
+            # Cached listings carry folder stats from the previous metrics
+            _listing_cache.clear()
+            _page_cache.clear()
+            print(f"Loaded metrics for {len(_metrics_data)} folders (computed at {data.get('computed_at', 'unknown')})")
         else:
             print(f"Warning: Metrics file not found at {METRICS_FILE}")
             print("Run 'python compute_metrics.py' to generate metrics for faster performance")
     except Exception as e:
-        print(f"Error loading metrics: {e}")
-        _metrics_data = {}
+        # A bad reload (e.g. a half-written file) keeps the last good table; the
+        # unchanged _metrics_mtime makes the next check try again
+        print(f"Error loading metrics, keeping the previous {len(_metrics_data)} folders: {e}")
+
+
+def refresh_metrics():
+    """Reload metrics if metrics.json changed, checking at most every METRICS_RELOAD_INTERVAL seconds."""
+    global _metrics_checked_at
+    now = time.monotonic()
+    if now - _metrics_checked_at < METRICS_RELOAD_INTERVAL:
+        return
+    _metrics_checked_at = now
+    try:
+        mtime = METRICS_FILE.stat().st_mtime
+    except OSError:
+        return
+    if mtime != _metrics_mtime:
+        load_metrics()
 
 
 # Load metrics on startup
 load_metrics()
+_metrics_checked_at = time.monotonic()
+
+
+@app.before_request
+def _refresh_metrics_before_request():
+    """Pick up a new metrics.json without restarting the workers."""
+    refresh_metrics()
+
 
 # Minimal HTML for 404 (file/prefix not found or reserved path)
 NOT_FOUND_HTML = (
@@ -61,6 +284,7 @@ def not_found_response():
     return Response(NOT_FOUND_HTML, status=404, mimetype="text/html")
 
 
+@lru_cache(maxsize=4096)
 def _http_last_modified(dt):
     """Format S3 LastModified datetime as HTTP Last-Modified header value."""
     if dt.tzinfo:
@@ -68,16 +292,144 @@ def _http_last_modified(dt):
     return dt.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
 
+# (divisor, format) for each 1024x step; everything from 1 TiB up is shown in TB
+_SIZE_UNITS = (
+    (1, "{:.0f} B"),
+    (1024, "{:.1f} KB"),
+    (1024 ** 2, "{:.1f} MB"),
+    (1024 ** 3, "{:.2f} GB"),
+    (1024 ** 4, "{:.2f} TB"),
+)
+
+
+@lru_cache(maxsize=8192)
 def format_size(size_bytes):
     """Format bytes to human readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    # bit_length picks the unit without comparing against each threshold
+    divisor, fmt = _SIZE_UNITS[min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)]
+    return fmt.format(size_bytes / divisor)
+
+
+def _new_folder_totals():
+    """Running totals for a folder whose stats are computed from a live listing."""
+    return {"size": 0, "file_count": 0, "latest_all": None, "latest_display": None}
+
+
+def _add_to_folder_totals(totals, prefix, obj):
+    """Count one object under folder prefix into its running totals."""
+    totals["size"] += obj.get("Size", 0)
+    totals["file_count"] += 1
+    lm = obj["LastModified"]
+    if totals["latest_all"] is None or lm > totals["latest_all"]:
+        totals["latest_all"] = lm
+    if not exclude_key_for_folder_modified_date(prefix, obj["Key"]):
+        if totals["latest_display"] is None or lm > totals["latest_display"]:
+            totals["latest_display"] = lm
+
+
+def _merge_folder_totals(totals, other):
+    """Add the running totals of part of a folder into the folder's totals."""
+    totals["size"] += other["size"]
+    totals["file_count"] += other["file_count"]
+    for field in ("latest_all", "latest_display"):
+        if other[field] is not None and (totals[field] is None or other[field] > totals[field]):
+            totals[field] = other[field]
+
+
+@dataclass(slots=True)
+class _ScanBudget:
+    """Keys and time left for one live listing, shared by the listings it splits into."""
+
+    deadline: float
+    keys_left: int = LIVE_LISTING_MAX_KEYS
+
+    def spend(self, keys):
+        """Count keys as listed; False once the key cap or the deadline is reached."""
+        self.keys_left -= keys
+        return self.keys_left > 0 and time.monotonic() < self.deadline
+
+
+def _new_scan_budget():
+    return _ScanBudget(time.monotonic() + LIVE_STATS_TIMEOUT)
+
+
+def _scan_folder_totals(scan_prefix, prefix, budget):
+    """Running totals for everything under scan_prefix, counted toward folder prefix.
+
+    None if budget runs out first.
+    """
+    totals = _new_folder_totals()
+    if not budget.spend(0):
+        return None  # Out of budget before this split got a worker
+    for page in _list_object_pages(scan_prefix):
+        contents = page.get("Contents", [])
+        for obj in contents:
+            _add_to_folder_totals(totals, prefix, obj)
+        if page.get("IsTruncated") and not budget.spend(len(contents)):
+            return None
+    return totals
+
+
+def _live_folder_totals(prefix):
+    """Running totals for folder prefix from a live listing.
+
+    A folder that fits in one page is counted from it. A bigger one is listed
+    one level down instead, and its subfolders are totalled side by side, so
+    the wait is roughly the largest subfolder's listing rather than all of them.
+    None once LIVE_LISTING_MAX_KEYS keys or LIVE_STATS_TIMEOUT seconds are used
+    up, since a partial count would pass for the folder's real size.
+    """
+    budget = _new_scan_budget()
+    first = S3_CLIENT.list_objects_v2(Bucket=BUCKET_NAME, Prefix=prefix, MaxKeys=LIST_MAX_KEYS)
+    totals = _new_folder_totals()
+    if not first.get("IsTruncated"):
+        for obj in first.get("Contents", []):
+            _add_to_folder_totals(totals, prefix, obj)
+        return totals
+
+    subfolders = []
+    for page in _list_object_pages(prefix, Delimiter="/"):
+        subfolders.extend(common["Prefix"] for common in page.get("CommonPrefixes", []))
+        for obj in page.get("Contents", []):
+            _add_to_folder_totals(totals, prefix, obj)
+    parts = [_SPLIT_POOL.submit(_scan_folder_totals, subfolder, prefix, budget) for subfolder in subfolders]
+    for part in parts:
+        part_totals = part.result()
+        if part_totals is None:
+            for rest in parts:
+                rest.cancel()
+            print(f"Stopped totalling {prefix}: over the live listing budget")
+            return None
+        _merge_folder_totals(totals, part_totals)
+    return totals
+
+
+def _folder_totals_stats(totals):
+    """Convert running folder totals into the same shape as a metrics.json entry."""
+    chosen_modified = totals["latest_display"] or totals["latest_all"]
+
+    return {
+        "size": totals["size"],
+        "size_display": format_size(totals["size"]),
+        "file_count": totals["file_count"],
+        # isoformat skips strftime's locale handling; [:16] drops any UTC offset
+        "modified": chosen_modified.isoformat(sep=" ", timespec="minutes")[:16] if chosen_modified else "-"
+    }
+
+
+def _list_object_pages(prefix, **params):
+    """Yield list_objects_v2 responses under prefix, following continuation tokens.
+
+    Most folders fit in one response, so this calls the client directly rather
+    than building a paginator for every listing.
+    """
+    params.update(Bucket=BUCKET_NAME, Prefix=prefix, MaxKeys=LIST_MAX_KEYS)
+    while True:
+        page = S3_CLIENT.list_objects_v2(**params)
+        yield page
+        if not page.get("IsTruncated"):
+            return
+        params["ContinuationToken"] = page["NextContinuationToken"]
 
 
 def get_folder_stats(prefix):
@@ -86,83 +438,240 @@ def get_folder_stats(prefix):
     Falls back to live S3 API call if metrics not available.
     """
     # Try precomputed metrics first
-    if prefix in _metrics_data:
-        return _metrics_data[prefix]
+    stats = _metrics_data.get(prefix)
+    if stats is not None:
+        return stats
 
     # Fallback to live S3 API call (slow path)
     print(f"Warning: No precomputed metrics for {prefix}, falling back to S3 API")
-    paginator = S3_CLIENT.get_paginator("list_objects_v2")
-    total_size = 0
-    file_count = 0
-    latest_modified_all = None
-    latest_modified_display = None
+    totals = _live_folder_totals(prefix)
+    if totals is None:
+        return _UNKNOWN_FOLDER_STATS
+    return _folder_totals_stats(totals)
 
-    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
-        for obj in page.get("Contents", []):
-            key = obj["Key"]
-            total_size += obj.get("Size", 0)
-            file_count += 1
-            lm = obj["LastModified"]
-            if latest_modified_all is None or lm > latest_modified_all:
-                latest_modified_all = lm
-            if not exclude_key_for_folder_modified_date(prefix, key):
-                if latest_modified_display is None or lm > latest_modified_display:
-                    latest_modified_display = lm
 
-    chosen_modified = latest_modified_display or latest_modified_all
+def _live_folder_stats(prefix):
+    """Future for folder prefix's live stats, shared by every listing that needs them.
 
-    return {
-        "size": total_size,
-        "size_display": format_size(total_size),
-        "file_count": file_count,
-        "modified": chosen_modified.strftime("%Y-%m-%d %H:%M") if chosen_modified else "-"
-    }
+    A listing that outlives LIVE_STATS_TIMEOUT keeps running in _STATS_POOL; later
+    pages wait on that one, then reuse its result for LISTING_CACHE_TTL, instead
+    of starting the same scan again. A failed one is retried on the next request.
+    """
+    future = _cache_get(_live_stats_cache, prefix)
+    if future is not None and not (future.done() and future.exception() is not None):
+        return future
+    future = _STATS_POOL.submit(get_folder_stats, prefix)
+    _cache_put(_live_stats_cache, prefix, future, ttl=float("inf"))
+    # The result's lifetime counts from when it arrives, not from the submit
+    future.add_done_callback(lambda done: _cache_put(_live_stats_cache, prefix, done))
+    return future
+
+
+def _cache_get(cache, key):
+    """Return the cached value for key, or None if it is missing or expired."""
+    entry = cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_put(cache, key, value, ttl=LISTING_CACHE_TTL):
+    """Cache value for ttl seconds, dropping the oldest entry when full."""
+    with _cache_lock:
+        if key not in cache and len(cache) >= LISTING_CACHE_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest
+            cache.pop(next(iter(cache)), None)
+        cache[key] = (time.monotonic() + ttl, value)
+
+
+def _has_unknown_stats(folders):
+    """True if any folder row shows "-" for stats that timed out or failed."""
+    return any(folder.size_display == _UNKNOWN_FOLDER_STATS["size_display"] for folder in folders)
 
 
 def list_directory(prefix=""):
+    """List contents of a directory (prefix), served from a short-lived cache."""
+    cached = _cache_get(_listing_cache, prefix)
+    if cached is not None:
+        return cached
+    listing = _list_directory_s3(prefix)
+    ttl = PARTIAL_LISTING_CACHE_TTL if _has_unknown_stats(listing[0]) else LISTING_CACHE_TTL
+    _cache_put(_listing_cache, prefix, listing, ttl=ttl)
+    return listing
+
+
+# Listing rows; slotted so folders with tens of thousands of files stay compact.
+# Templates read them by attribute and orjson serializes them as objects.
+@dataclass(slots=True)
+class FolderRow:
+    name: str
+    path: str
+    size: int
+    size_display: str
+    file_count: int
+    modified: str
+
+
+@dataclass(slots=True)
+class FileRow:
+    name: str
+    path: str
+    size: int
+    size_display: str
+    modified: str
+    is_json: bool
+    view_url: str | None
+
+
+def _folder_row(prefix, folder_path, stats):
+    """Directory listing row for a subfolder of prefix."""
+    return FolderRow(
+        folder_path[len(prefix):].rstrip("/"),
+        folder_path,
+        stats["size"],
+        stats["size_display"],
+        stats["file_count"],
+        stats["modified"],
+    )
+
+
+def _file_row(prefix, obj):
+    """Directory listing row for an object directly under prefix."""
+    key = obj["Key"]
+    # JSON files get a View link; decided here once rather than per render
+    is_json = key.lower().endswith(".json")
+    return FileRow(
+        key[len(prefix):],
+        key,
+        obj["Size"],
+        format_size(obj["Size"]),
+        obj["LastModified"].isoformat(sep=" ", timespec="minutes")[:16],
+        is_json,
+        f"/{key}?view" if is_json else None,
+    )
+
+
+def _list_directory_s3(prefix):
     """List contents of a directory (prefix) in S3."""
-    folders = []
-    files = []
+    if _metrics_data.has_subfolders(prefix):
+        # Some subfolders have stats in metrics.json; only the rest need live listings
+        folders, files = _list_directory_delimited(prefix)
+    else:
+        # None do (no metrics, or below the deepest level compute_metrics.py records)
+        folders, files = _list_directory_recursive(prefix)
+
+    # Sort alphabetically
+    folders.sort(key=lambda x: x.name.lower())
+    files.sort(key=lambda x: x.name.lower())
 
-    paginator = S3_CLIENT.get_paginator("list_objects_v2")
+    return folders, files
+
+
+def _list_level(prefix):
+    """Subfolder prefixes and file rows directly under prefix, from a delimited listing."""
+    folder_paths = []
+    files = []
 
-    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix, Delimiter="/"):
+    for page in _list_object_pages(prefix, Delimiter="/"):
         # Get folders
-        for prefix_obj in page.get("CommonPrefixes", []):
-            folder_path = prefix_obj["Prefix"]
-            folder_name = folder_path[len(prefix):].rstrip("/")
-            stats = get_folder_stats(folder_path)
-            folders.append({
-                "name": folder_name,
-                "path": folder_path,
-                "size": stats["size"],
-                "size_display": stats["size_display"],
-                "file_count": stats["file_count"],
-                "modified": stats["modified"]
-            })
+        folder_paths.extend(prefix_obj["Prefix"] for prefix_obj in page.get("CommonPrefixes", []))
 
         # Get files
         for obj in page.get("Contents", []):
             key = obj["Key"]
             if key == prefix:
                 continue
-            file_name = key[len(prefix):]
-            if "/" not in file_name:
-                files.append({
-                    "name": file_name,
-                    "path": key,
-                    "size": obj["Size"],
-                    "size_display": format_size(obj["Size"]),
-                    "modified": obj["LastModified"].strftime("%Y-%m-%d %H:%M")
-                })
+            if "/" not in key[len(prefix):]:
+                files.append(_file_row(prefix, obj))
 
-    # Sort alphabetically
-    folders.sort(key=lambda x: x["name"].lower())
-    files.sort(key=lambda x: x["name"].lower())
+    return folder_paths, files
+
+
+def _list_directory_delimited(prefix):
+    """List one level of prefix, taking subfolder stats from metrics.json."""
+    folder_paths, files = _list_level(prefix)
+
+    # Subfolders missing from metrics.json each need a live listing; run them side by side
+    live = {
+        folder_path: _live_folder_stats(folder_path)
+        for folder_path in folder_paths
+        if folder_path not in _metrics_data
+    }
+    # One deadline for all of them, so a slow page waits LIVE_STATS_TIMEOUT at most
+    deadline = time.monotonic() + LIVE_STATS_TIMEOUT
+    folders = []
+    for folder_path in folder_paths:
+        if folder_path in live:
+            try:
+                stats = live[folder_path].result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                print(f"Timed out computing stats for {folder_path}")
+                stats = _UNKNOWN_FOLDER_STATS
+            except (BotoCoreError, ClientError) as e:
+                print(f"Error computing stats for {folder_path}: {e}")
+                stats = _UNKNOWN_FOLDER_STATS
+        else:
+            stats = get_folder_stats(folder_path)
+        folders.append(_folder_row(prefix, folder_path, stats))
 
     return folders, files
 
 
+def _list_directory_recursive(prefix):
+    """List everything under prefix once, totalling each subfolder as it goes.
+
+    Used when subfolder stats would otherwise each need their own live
+    listing: one pass replaces one LIST walk per subfolder.
+    """
+    subfolders = {}
+    files = []
+    # Bounded like the live listings of _list_directory_delimited
+    budget = _new_scan_budget()
+
+    for page in _list_object_pages(prefix):
+        contents = page.get("Contents", [])
+        for obj in contents:
+            key = obj["Key"]
+            if key == prefix:
+                continue  # The folder's own placeholder object
+            slash = key.find("/", len(prefix))
+            if slash == -1:
+                files.append(_file_row(prefix, obj))
+                continue
+            folder_path = key[:slash + 1]
+            totals = subfolders.get(folder_path)
+            if totals is None:
+                totals = subfolders[folder_path] = _new_folder_totals()
+            _add_to_folder_totals(totals, folder_path, obj)
+        if contents and page.get("IsTruncated") and not budget.spend(len(contents)):
+            print(f"Stopped totalling {prefix or '/'}: over the live listing budget")
+            return _partial_recursive_listing(prefix, subfolders, contents[-1]["Key"])
+
+    folders = [
+        _folder_row(prefix, folder_path, _folder_totals_stats(totals))
+        for folder_path, totals in subfolders.items()
+    ]
+    return folders, files
+
+
+def _partial_recursive_listing(prefix, subfolders, last_key):
+    """Listing of prefix for a recursive scan of it that stopped at last_key.
+
+    Names come from a delimited listing. All keys under a folder sort together,
+    so a subfolder the scan got past has complete totals; any other shows "-".
+    """
+    folder_paths, files = _list_level(prefix)
+    folders = []
+    for folder_path in folder_paths:
+        totals = subfolders.get(folder_path)
+        if totals is None or last_key.startswith(folder_path):
+            stats = _UNKNOWN_FOLDER_STATS
+        else:
+            stats = _folder_totals_stats(totals)
+        folders.append(_folder_row(prefix, folder_path, stats))
+    return folders, files
+
+
 def s3_head_object(key):
     """Return S3 object metadata if key exists, else None."""
     try:
@@ -171,101 +680,180 @@ def s3_head_object(key):
         return None
 
 
+def resolve_path(key):
+    """Find out with one LIST whether key is a file, a folder, or neither.
+
+    Returns (head, is_folder); head has head_object's ContentLength, ETag and
+    LastModified when key is a file (a file wins over a folder of the same name).
+    Listing key itself with "/" as delimiter yields the object key first, then
+    any siblings that share its name as a prefix, then the folder key + "/".
+    """
+    try:
+        resp = S3_CLIENT.list_objects_v2(
+            Bucket=BUCKET_NAME, Prefix=key, Delimiter="/", MaxKeys=LIST_MAX_KEYS
+        )
+    except ClientError:
+        return None, False
+    contents = resp.get("Contents", [])
+    if contents and contents[0]["Key"] == key:
+        obj = contents[0]
+        return {"ContentLength": obj["Size"], "ETag": obj["ETag"], "LastModified": obj["LastModified"]}, False
+    folder = key + "/"
+    if any(common["Prefix"] == folder for common in resp.get("CommonPrefixes", [])):
+        return None, True
+    if resp.get("IsTruncated"):
+        # Over LIST_MAX_KEYS siblings sort before the folder; ask about it directly
+        return None, prefix_has_contents(folder)
+    return None, False
+
+
 def prefix_has_contents(prefix):
     """Return True if S3 prefix has any objects or common prefixes (directory)."""
+    cached = _cache_get(_prefix_cache, prefix)
+    if cached is not None:
+        return cached
     try:
         resp = S3_CLIENT.list_objects_v2(
             Bucket=BUCKET_NAME, Prefix=prefix, Delimiter="/", MaxKeys=1
         )
-        if resp.get("Contents") or resp.get("CommonPrefixes"):
-            return True
-        return False
     except ClientError:
         return False
+    has_contents = bool(resp.get("Contents") or resp.get("CommonPrefixes"))
+    _cache_put(_prefix_cache, prefix, has_contents, ttl=PREFIX_CACHE_TTL)
+    return has_contents
+
+
+@lru_cache(maxsize=4096)
+def _signed_url(s3_key, expiration, window):
+    """Sign a download URL; window only takes part in the cache key."""
+    return S3_CLIENT.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": BUCKET_NAME, "Key": s3_key},
+        ExpiresIn=expiration
+    )
 
 
 def get_presigned_url(s3_key, expiration=3600):
     """Generate a presigned URL for downloading a file."""
+    # URLs are re-signed every half expiration, so a cached one always has at
+    # least half its lifetime left when it is handed out
+    window = int(time.time()) // max(expiration // 2, 1)
     try:
-        params = {"Bucket": BUCKET_NAME, "Key": s3_key}
-        return S3_CLIENT.generate_presigned_url(
-            "get_object",
-            Params=params,
-            ExpiresIn=expiration
-        )
+        return _signed_url(s3_key, expiration, window)
     except ClientError:
         return None
 
 
+def get_download_url(s3_key):
+    """URL a file download redirects to: on DOWNLOAD_CDN_URL if set, else presigned S3."""
+    if DOWNLOAD_CDN_URL:
+        return f"{DOWNLOAD_CDN_URL}/{quote(s3_key)}"
+    return get_presigned_url(s3_key)
+
+
+Breadcrumb = namedtuple("Breadcrumb", ["name", "path"])
+
+
+@lru_cache(maxsize=4096)
 def get_parent_path(path):
-    """Get parent directory path."""
-    if not path or path == "/":
-        return ""
-    path = path.rstrip("/")
-    if "/" in path:
-        return path.rsplit("/", 1)[0] + "/"
-    return ""
+    """Get parent directory path of a folder prefix (see folder_prefix)."""
+    parent = path[:-1].rpartition("/")[0]
+    return parent + "/" if parent else ""
 
 
+@lru_cache(maxsize=4096)
 def get_breadcrumbs(path):
-    """Generate breadcrumb navigation."""
+    """Generate breadcrumb navigation (cached, so returned as an immutable tuple)."""
     if not path:
-        return []
-
-    parts = path.rstrip("/").split("/")
-    breadcrumbs = []
-    current = ""
+        return ()
 
-    for part in parts:
-        current += part + "/"
-        breadcrumbs.append({
-            "name": part,
-            "path": current
-        })
-
-    return breadcrumbs
+    parts = path[:-1].split("/")
+    # Each crumb's path is every part up to and including it
+    paths = accumulate(part + "/" for part in parts)
+    return tuple(Breadcrumb(part, current) for part, current in zip(parts, paths))
 
 
 def is_translator_kg_internal_path(path: str) -> bool:
     """True when browsing releases/translator_kg (not translator_kg_open)."""
-    normalized = path.rstrip("/")
-    if normalized == "releases/translator_kg":
-        return True
-    return normalized.startswith("releases/translator_kg/")
+    return path.startswith("releases/translator_kg/")
+
+
+def folder_prefix(path):
+    """Canonical S3 prefix for a folder path: "" for the root, else ending in one /.
+
+    Routes normalize once with this, so the helpers below can rely on the form.
+    """
+    path = path.strip("/")
+    return path + "/" if path else ""
 
 
 def browse_directory(path):
-    """Shared function to browse a directory path."""
-    # Ensure path ends with / for directories
-    if path and not path.endswith("/"):
-        path += "/"
-    
+    """Shared function to browse a directory path (a canonical folder_prefix)."""
+    # ?refresh=true skips the cached listing, e.g. right after an upload
+    if request.args.get("refresh", "").lower() == "true":
+        _listing_cache.pop(path, None)
+        _page_cache.pop(path, None)
+        _drop_prerendered_page(path)
+        # Finished live stats below it too; running ones are still waited on
+        with _cache_lock:
+            for key, (_, future) in list(_live_stats_cache.items()):
+                if key.startswith(path) and future.done():
+                    _live_stats_cache.pop(key, None)
+
+    # The page depends only on the path, so repeat views reuse the rendered HTML
+    cached = _cache_get(_page_cache, path)
+    if cached is None:
+        try:
+            context = _directory_context(path)
+        except ClientError as e:
+            return f"Error: {e}", 500
+        page = HTML_PAGE.render(**context)
+        partial = _has_unknown_stats(context["folders"])
+        cached = (page, hashlib.md5(page.encode("utf-8")).hexdigest(), partial)
+        _cache_put(_page_cache, path, cached, ttl=PARTIAL_LISTING_CACHE_TTL if partial else LISTING_CACHE_TTL)
+
+    page, etag, partial = cached
+    resp = Response(page, mimetype="text/html")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = PARTIAL_PAGE_CACHE_CONTROL if partial else PAGE_CACHE_CONTROL
+    # Answers 304 when the browser already has this exact page
+    return resp.make_conditional(request)
+
+
+def _drop_prerendered_page(path):
+    """Delete render_cache.py's copy of folder path, so nginx passes plain requests on too."""
+    page_cache_dir = PAGE_CACHE_DIR.resolve()
+    page_file = (page_cache_dir / path / "index.html").resolve()
+    if not page_file.is_relative_to(page_cache_dir):
+        return
     try:
-        folders, files = list_directory(path)
-        parent = get_parent_path(path) if path else None
-        breadcrumbs = get_breadcrumbs(path)
-
-        # Calculate totals
-        total_size = sum(f["size"] for f in folders) + sum(f["size"] for f in files)
-        total_files = sum(f["file_count"] for f in folders) + len(files)
-
-        return render_template_string(
-            HTML_TEMPLATE,
-            path=path,
-            parent=parent,
-            breadcrumbs=breadcrumbs,
-            folders=folders,
-            files=files,
-            bucket=BUCKET_NAME,
-            total_size=format_size(total_size),
-            total_files=total_files,
-            folder_count=len(folders),
-            file_count=len(files),
-            show_translator_kg_notice=is_translator_kg_internal_path(path),
-            translator_kg_open_url=f"/{TRANSLATOR_KG_OPEN_PATH}",
-        )
-    except ClientError as e:
-        return f"Error: {e}", 500
+        page_file.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Error removing prerendered page {page_file}: {e}")
+
+
+def _directory_context(path):
+    """Everything the listing page shows for directory path (ending in / unless root)."""
+    folders, files = list_directory(path)
+
+    # Calculate totals
+    total_size = sum(f.size for f in folders) + sum(f.size for f in files)
+    total_files = sum(f.file_count for f in folders) + len(files)
+
+    return {
+        "path": path,
+        "parent": get_parent_path(path) if path else None,
+        "breadcrumbs": get_breadcrumbs(path),
+        "folders": folders,
+        "files": files,
+        "bucket": BUCKET_NAME,
+        "total_size": format_size(total_size),
+        "total_files": total_files,
+        "folder_count": len(folders),
+        "file_count": len(files),
+        "show_translator_kg_notice": is_translator_kg_internal_path(path),
+        "translator_kg_open_url": f"/{TRANSLATOR_KG_OPEN_PATH}",
+    }
 
 
 @app.route("/")
@@ -276,42 +864,48 @@ def index():
     
     # Redirect legacy query parameter URLs to clean URLs
     if path:
-        # Ensure path ends with / for directory browsing
-        clean_path = path if path.endswith("/") else path + "/"
-        return redirect(f"/{clean_path}", code=301)
+        return redirect(f"/{folder_prefix(path)}", code=301)
     
     return browse_directory("")
 
 
-def _render_json_viewer(s3_key):
+def _render_json_viewer(s3_key, head):
     # Shared logic for HTML JSON viewer (canonical path with ?view)
-    try:
-        response = S3_CLIENT.get_object(Bucket=BUCKET_NAME, Key=s3_key)
-        json_content = response['Body'].read().decode('utf-8')
-        try:
-            parsed_json = json.loads(json_content)
-            formatted_json = json.dumps(parsed_json, indent=2)
-        except json.JSONDecodeError:
-            formatted_json = json_content
-        file_name = s3_key.split('/')[-1]
-        file_size = format_size(response['ContentLength'])
-        last_modified = response['LastModified'].strftime("%Y-%m-%d %H:%M:%S")
-        download_url = f"/{s3_key}"
-        parent_path = '/'.join(s3_key.split('/')[:-1])
-        if parent_path:
-            parent_path += '/'
-        return render_template_string(
-            JSON_VIEWER_TEMPLATE,
-            file_name=file_name,
-            file_size=file_size,
-            last_modified=last_modified,
-            json_content=formatted_json,
-            download_url=download_url,
-            parent_path=parent_path,
-            s3_key=s3_key
-        )
-    except ClientError as e:
-        return f"Error loading file: {e}", 500
+    # The page only changes with the object or the viewer template
+    s3_etag = head.get("ETag", "").strip('"')
+    etag = f"{s3_etag}-{JSON_VIEWER_VERSION}"
+    if not is_resource_modified(request.environ, etag=etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+        return resp
+    total_size = head["ContentLength"]
+    truncated = total_size > JSON_VIEWER_MAX_BYTES
+    file_name = s3_key.split('/')[-1]
+    file_size = format_size(total_size)
+    last_modified = head['LastModified'].isoformat(sep=" ", timespec="seconds")[:19]
+    download_url = f"/{s3_key}"
+    parent_path = '/'.join(s3_key.split('/')[:-1])
+    if parent_path:
+        parent_path += '/'
+    # The page carries no document: the browser fetches it from /stream/ (which
+    # honours Range, so a large file is cut to the preview in S3) and indents
+    # and highlights it there (public/viewer.js)
+    resp = Response(JSON_VIEWER_PAGE.render(
+        file_name=file_name,
+        file_size=file_size,
+        last_modified=last_modified,
+        source_url=f"/stream/{quote(s3_key)}",
+        truncated=truncated,
+        preview_bytes=JSON_VIEWER_MAX_BYTES,
+        preview_size=format_size(JSON_VIEWER_MAX_BYTES),
+        download_url=download_url,
+        parent_path=parent_path,
+        s3_key=s3_key
+    ), mimetype="text/html")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+    return resp
 
 
 @app.route("/health")
@@ -330,30 +924,155 @@ def health():
 @app.route("/docs")
 def docs():
     """Documentation page for file access."""
-    return render_template_string(DOCS_TEMPLATE, bucket=BUCKET_NAME, site_url=SITE_URL)
+    encoding = request.accept_encodings.best_match(DOCS_PAGE_ENCODED)
+    body = DOCS_PAGE_ENCODED[encoding] if encoding else DOCS_PAGE_BYTES
+    resp = Response(body, mimetype="text/html")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    # Each encoding is a distinct representation, so each gets its own ETag
+    resp.set_etag(f"{DOCS_PAGE_ETAG}-{encoding}" if encoding else DOCS_PAGE_ETAG)
+    resp.headers["Cache-Control"] = DOCS_CACHE_CONTROL
+    return resp.make_conditional(request)
 
 
 @app.route("/public/<path:filename>")
 def serve_public(filename):
-    """Serve static files from public directory."""
-    return send_from_directory(PUBLIC_DIR, filename)
+    """Serve static files from public directory.
+
+    Behind the bundled nginx config nginx serves them itself; the Docker image
+    has no nginx, so there every asset comes through here, with the same headers.
+    """
+    if "v" in request.args:
+        # Versioned by asset_url: the content behind this URL never changes
+        resp = send_from_directory(PUBLIC_DIR, filename, max_age=PUBLIC_VERSIONED_MAX_AGE)
+        resp.cache_control.immutable = True
+        return resp
+    return send_from_directory(PUBLIC_DIR, filename, max_age=PUBLIC_MAX_AGE)
+
+
+@lru_cache(maxsize=None)
+def asset_url(filename):
+    """URL for a file in public/ that changes whenever the file's content does."""
+    digest = hashlib.md5((PUBLIC_DIR / filename).read_bytes()).hexdigest()[:10]
+    return f"/public/{filename}?v={digest}"
+
+
+app.jinja_env.globals["asset_url"] = asset_url
+
+
+@app.route("/api/list/", defaults={"folder_path": ""})
+@app.route("/api/list/<path:folder_path>")
+def api_list(folder_path):
+    """Directory listing as JSON; the listing page uses it to move between folders in place."""
+    try:
+        context = _directory_context(folder_prefix(folder_path))
+    except ClientError as e:
+        return {"error": str(e)}, 500
+    context["breadcrumbs"] = [crumb._asdict() for crumb in context["breadcrumbs"]]
+    # orjson encodes straight to bytes, skipping jsonify's slower stdlib encoder
+    resp = Response(orjson.dumps(context), mimetype="application/json")
+    if _has_unknown_stats(context["folders"]):
+        resp.headers["Cache-Control"] = PARTIAL_PAGE_CACHE_CONTROL
+    else:
+        resp.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+    return resp
+
+
+@app.route("/stream/<path:s3_key>")
+def stream_file(s3_key):
+    """Proxy a file from S3 in one connection, passing Range through for resumable downloads.
+
+    An opt-in alternative to the presigned-URL redirect: the client gets the bytes
+    from this server (and anything caching in front of it) instead of from S3.
+    """
+    if STREAM_X_ACCEL:
+        if request.headers.get("X-S3-Missing") == "1":
+            # nginx's /_s3 got a 403 or 404 from S3 and asks for the usual page
+            return not_found_response()
+        return _x_accel_stream(s3_key)
+    params = {"Bucket": BUCKET_NAME, "Key": s3_key}
+    if "Range" in request.headers:
+        params["Range"] = request.headers["Range"]
+    try:
+        obj = S3_CLIENT.get_object(**params)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("NoSuchKey", "404"):
+            return not_found_response()
+        if code == "InvalidRange":
+            return Response(status=416)
+        return f"Error loading file: {e}", 500
+
+    body = obj["Body"]
+    status = obj["ResponseMetadata"]["HTTPStatusCode"]
+    mimetype = obj.get("ContentType") or "application/octet-stream"
+    if (
+        status == 200
+        and obj["ContentLength"] <= JSON_VIEWER_MAX_BYTES
+        and mimetype.partition(";")[0].strip() in app.config["COMPRESS_MIMETYPES"]
+    ):
+        # A whole text file the viewer shows in full: small enough to hold, so
+        # compress_response can encode it instead of streaming it as stored
+        try:
+            resp = Response(body.read(), status=status, mimetype=mimetype)
+        finally:
+            body.close()
+    else:
+        resp = Response(
+            body.iter_chunks(chunk_size=1 << 20),
+            status=status,
+            mimetype=mimetype,
+            direct_passthrough=True,
+        )
+        resp.headers["Content-Length"] = str(obj["ContentLength"])
+        # Release the S3 connection even if the client disconnects mid-download
+        resp.call_on_close(body.close)
+    resp.headers["Accept-Ranges"] = "bytes"
+    resp.headers["Last-Modified"] = _http_last_modified(obj["LastModified"])
+    if obj.get("ETag"):
+        resp.headers["ETag"] = obj["ETag"]
+    if obj.get("ContentRange"):
+        resp.headers["Content-Range"] = obj["ContentRange"]
+    return resp
+
+
+def _x_accel_stream(s3_key):
+    """Hand a /stream/ download to nginx, which proxies it from a presigned S3 URL.
+
+    nginx forwards the client's Range header and S3's status and headers, so
+    resumed downloads behave as with the in-process proxy. S3's 403 or 404 (an
+    XML error body) is not passed on: nginx asks the app again with X-S3-Missing
+    set, for the same not-found page.
+    """
+    url = get_presigned_url(s3_key)
+    if not url:
+        return "Error generating download URL", 500
+    resp = Response(status=200)
+    resp.headers["X-Accel-Redirect"] = "/_s3"
+    # In a header rather than the redirect URI, which nginx would percent-decode
+    resp.headers["X-S3-Url"] = url
+    # S3 sends the real headers; don't let Flask's defaults stand in for them
+    del resp.headers["Content-Type"]
+    return resp
 
 
 @app.route("/<path:folder_path>")
 def browse_path(folder_path):
     """Browse directory using clean URL path (e.g., /releases/alliance/latest/).
     
-    This catch-all route must come AFTER specific routes like /docs/, /public/.
+    This catch-all route must come AFTER specific routes like /docs/, /public/, /stream/, /api/.
     Legacy /view/ and /download/ paths are not routed; requests to them hit this and 404.
     
-    File vs directory (no trailing slash): HEAD the path; if object exists, serve file.
-    If HEAD 404, check if path is a prefix with contents; if so, redirect to path + /
-    (directory path without trailing slash -> redirect to canonical directory URL).
-    If neither object nor prefix exists, return 404. Only ?view is significant;
-    other query params are ignored; redirects use request.path (no query string).
+    File vs directory (no trailing slash): one LIST of the path (see resolve_path); if an
+    object has exactly that key, serve file. Otherwise, if path + / has contents, redirect
+    to it (directory path without trailing slash -> redirect to canonical directory URL).
+    If neither object nor prefix exists, return 404. Only ?view (files) and
+    ?refresh=true (directories) are significant; other query params are ignored;
+    redirects use request.path (no query string).
     """
     # Safety check: reserve top-level path names (legacy /view, /download and other routes)
-    if folder_path.rstrip("/") in ("view", "download", "docs", "public"):
+    if folder_path.rstrip("/") in ("view", "download", "docs", "public", "stream", "api"):
         return not_found_response()
 
     # Path with trailing slash: treat as directory (list prefix)
@@ -361,14 +1080,17 @@ def browse_path(folder_path):
         return browse_directory(folder_path)
 
     # No trailing slash: may be a file (single S3 object) or directory (prefix)
-    head = s3_head_object(folder_path)
+    head, is_folder = resolve_path(folder_path)
     if head:
         # It is a file: serve or show viewer based on ?view only; other params ignored
-        last_modified = _http_last_modified(head["LastModified"])
         if request.method == "HEAD":
-            # Return headers only (Last-Modified for polling; no body)
+            # Return headers only (Last-Modified for polling; no body). Listings
+            # carry no Content-Type, so this one needs the real HEAD
+            head = s3_head_object(folder_path)
+            if not head:
+                return not_found_response()
             resp = Response(status=200)
-            resp.headers["Last-Modified"] = last_modified
+            resp.headers["Last-Modified"] = _http_last_modified(head["LastModified"])
             resp.headers["Content-Length"] = str(head["ContentLength"])
             resp.headers["Content-Type"] = head.get("ContentType") or "application/octet-stream"
             return resp
@@ -376,25 +1098,35 @@ def browse_path(folder_path):
         is_json = folder_path.lower().endswith(".json")
         if has_view:
             if is_json:
-                return _render_json_viewer(folder_path)
+                return _render_json_viewer(folder_path, head)
             # Non-JSON with ?view: redirect to canonical URL (path only, no query)
             return redirect(request.path, code=302)
         if is_json:
-            # No ?view, JSON: return body with application/json and Last-Modified
+            # No ?view, JSON: stream the body as application/json with Last-Modified
             response = S3_CLIENT.get_object(Bucket=BUCKET_NAME, Key=folder_path)
-            body = response["Body"].read().decode("utf-8")
-            resp = Response(body, mimetype="application/json")
+            body = response["Body"]
+            resp = Response(
+                body.iter_chunks(chunk_size=1 << 16),
+                mimetype="application/json",
+                direct_passthrough=True,
+            )
             resp.headers["Last-Modified"] = _http_last_modified(response["LastModified"])
-            resp.headers["Content-Length"] = str(len(body.encode("utf-8")))
+            resp.headers["Content-Length"] = str(response["ContentLength"])
+            resp.headers["ETag"] = response["ETag"]
+            resp.call_on_close(body.close)
             return resp
-        # No ?view, non-JSON: redirect to presigned download URL
-        url = get_presigned_url(folder_path)
+        # No ?view, non-JSON: redirect to the CDN or a presigned download URL
+        url = get_download_url(folder_path)
         if url:
-            return redirect(url)
+            resp = redirect(url)
+            # Presigned URLs stay valid for at least half an hour (get_presigned_url);
+            # only the browser may reuse one, never a shared cache
+            resp.headers["Cache-Control"] = DOWNLOAD_REDIRECT_CACHE_CONTROL
+            return resp
         return "Error generating download URL", 500
 
-    # HEAD 404: path is not a file; check if it is a prefix (directory without trailing slash)
-    if prefix_has_contents(folder_path + "/"):
+    # Not a file; maybe a prefix (directory without trailing slash)
+    if is_folder:
         return redirect("/" + folder_path + "/", code=302)
     return not_found_response()
 
@@ -407,284 +1139,7 @@ HTML_TEMPLATE = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <link rel="icon" type="image/png" href="/public/favicon.png">
     <title>{{ path or '/' }} - Translator Ingests</title>
-    <style>
-        :root {
-            --bg: #f4f4f6;
-            --surface: #ffffff;
-            --surface-hover: #f8f8fa;
-            --border: #d4d4d8;
-            --text: #1e1e2e;
-            --text-dim: #71717a;
-            --accent: #7c3aed;
-            --accent-hover: #6d28d9;
-            --primary: #5b4b8a;
-            --primary-dark: #4a3a7a;
-            --folder: #7c3aed;
-            --file: #71717a;
-        }
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        body {
-            font-family: 'SF Mono', 'Fira Code', 'Consolas', monospace;
-            background: var(--bg);
-            color: var(--text);
-            line-height: 1.6;
-        }
-        .header {
-            background: var(--primary);
-            border-bottom: 2px solid var(--primary-dark);
-            padding: 16px 24px;
-        }
-        .header-content {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-        .header h1 {
-            font-size: 1.1em;
-            font-weight: 600;
-            letter-spacing: 0.5px;
-            margin-bottom: 4px;
-            color: #ffffff;
-        }
-        .header .path {
-            font-size: 0.85em;
-            color: rgba(255, 255, 255, 0.7);
-        }
-        .header .path a {
-            color: rgba(255, 255, 255, 0.9);
-            text-decoration: none;
-        }
-        .header .path a:hover {
-            color: #ffffff;
-            text-decoration: underline;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px 24px;
-        }
-        .toolbar {
-            display: flex;
-            align-items: center;
-            gap: 16px;
-            margin-bottom: 16px;
-        }
-        .back-btn {
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-            background: var(--surface);
-            color: var(--text);
-            padding: 8px 14px;
-            border-radius: 6px;
-            text-decoration: none;
-            font-size: 0.85em;
-            border: 1px solid var(--border);
-            transition: all 0.15s;
-        }
-        .back-btn:hover {
-            background: var(--accent);
-            color: #ffffff;
-            border-color: var(--accent);
-        }
-        .stats-bar {
-            display: flex;
-            gap: 24px;
-            font-size: 0.8em;
-            color: var(--text-dim);
-            margin-left: auto;
-        }
-        .stats-bar span {
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-        .tree {
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-        }
-        .tree-header {
-            display: grid;
-            grid-template-columns: 1fr 100px 140px 140px;
-            padding: 12px 16px;
-            background: #fafafb;
-            border-bottom: 2px solid var(--border);
-            font-size: 0.75em;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            color: var(--text-dim);
-        }
-        .tree-item {
-            display: grid;
-            grid-template-columns: 1fr 100px 140px 140px;
-            padding: 12px 16px;
-            border-bottom: 1px solid var(--border);
-            text-decoration: none;
-            color: inherit;
-            transition: background 0.1s;
-        }
-        .tree-item:last-child {
-            border-bottom: none;
-        }
-        .tree-item:hover {
-            background: var(--surface-hover);
-        }
-        .tree-name {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            font-weight: 500;
-        }
-        .tree-icon {
-            font-size: 1.1em;
-            width: 20px;
-            text-align: center;
-        }
-        .tree-icon.folder { color: var(--folder); }
-        .tree-icon.file { color: var(--file); }
-        .tree-name-link {
-            color: inherit;
-            text-decoration: none;
-        }
-        .tree-name-link:hover {
-            text-decoration: underline;
-        }
-        .tree-action {
-            font-size: 0.8em;
-            color: var(--accent);
-            text-decoration: none;
-            padding: 2px 8px;
-            border-radius: 4px;
-            background: rgba(124, 58, 237, 0.1);
-            margin-left: 8px;
-        }
-        .tree-action:hover {
-            background: rgba(124, 58, 237, 0.2);
-            text-decoration: none;
-        }
-        .tree-size, .tree-count, .tree-date {
-            font-size: 0.85em;
-            color: var(--text-dim);
-            display: flex;
-            align-items: center;
-        }
-        .tree-count {
-            font-size: 0.8em;
-        }
-        .empty {
-            padding: 60px 20px;
-            text-align: center;
-            color: var(--text-dim);
-        }
-        .empty-icon {
-            font-size: 3em;
-            margin-bottom: 16px;
-            opacity: 0.5;
-        }
-        .section-label {
-            padding: 8px 16px;
-            font-size: 0.7em;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            color: var(--accent);
-            background: #f8f8fa;
-            border-bottom: 1px solid var(--border);
-        }
-        .info-banner {
-            background: #fffbeb;
-            border: 1px solid #fcd34d;
-            border-radius: 8px;
-            padding: 16px 20px;
-            margin-bottom: 20px;
-            font-size: 0.9em;
-            line-height: 1.6;
-            color: #78350f;
-        }
-        .info-banner strong {
-            color: #92400e;
-        }
-        .info-banner a {
-            color: var(--accent);
-            font-weight: 600;
-            text-decoration: none;
-        }
-        .info-banner a:hover {
-            text-decoration: underline;
-        }
-        footer {
-            background: var(--surface);
-            border-top: 1px solid var(--border);
-            margin-top: 60px;
-            padding: 20px;
-        }
-        .footer-content {
-            max-width: 1200px;
-            margin: 0 auto;
-            display: flex;
-            align-items: center;
-            gap: 32px;
-        }
-        .footer-banner {
-            flex-shrink: 0;
-        }
-        .footer-banner img {
-            max-width: 300px;
-            height: auto;
-        }
-        .footer-info {
-            flex: 1;
-            color: var(--text-dim);
-            font-size: 0.75em;
-            line-height: 1.6;
-            text-align: left;
-        }
-        .footer-info h3 {
-            color: var(--text);
-            font-size: 1em;
-            font-weight: 600;
-            margin-bottom: 8px;
-        }
-        .footer-info p {
-            margin: 6px 0;
-        }
-        .footer-links {
-            margin-top: 8px;
-        }
-        .footer-links a {
-            color: var(--accent);
-            text-decoration: none;
-            font-weight: 500;
-        }
-        .footer-links a:hover {
-            text-decoration: underline;
-        }
-        @media (max-width: 768px) {
-            .tree-header, .tree-item {
-                grid-template-columns: 1fr 80px;
-            }
-            .tree-count, .tree-date {
-                display: none;
-            }
-            .footer-content {
-                flex-direction: column;
-                text-align: center;
-            }
-            .footer-info {
-                text-align: center;
-            }
-            .footer-banner img {
-                max-width: 200px;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('kgx.css') }}">
 </head>
 <body>
     <div class="header">
@@ -692,7 +1147,7 @@ HTML_TEMPLATE = """
             <div style="display: flex; justify-content: space-between; align-items: center;">
                 <div>
                     <h1>KGX STORAGE</h1>
-                    <div class="path">
+                    <div class="path" id="breadcrumbs">
                         <a href="/">s3://{{ bucket }}</a>{% for crumb in breadcrumbs %}/<a href="/{{ crumb.path }}">{{ crumb.name }}</a>{% endfor %}
                     </div>
                 </div>
@@ -706,7 +1161,7 @@ HTML_TEMPLATE = """
     </div>
 
     <div class="container">
-        <div class="toolbar">
+        <div class="toolbar" id="toolbar">
             {% if parent is not none %}
             <a href="/{{ parent }}" class="back-btn">
                 <span>&#8592;</span> Back
@@ -719,6 +1174,7 @@ HTML_TEMPLATE = """
             </div>
         </div>
 
+        <div id="notice">
         {% if show_translator_kg_notice %}
         <div class="info-banner">
             <strong>Internal use only.</strong>
@@ -727,6 +1183,7 @@ HTML_TEMPLATE = """
             <a href="{{ translator_kg_open_url }}">translator_kg_open</a>.
         </div>
         {% endif %}
+        </div>
 
         <div class="tree">
             <div class="tree-header">
@@ -736,6 +1193,7 @@ HTML_TEMPLATE = """
                 <span>Modified</span>
             </div>
 
+            <div id="tree-rows">
             {% if not folders and not files %}
             <div class="empty">
                 <div class="empty-icon">&#128193;</div>
@@ -767,8 +1225,8 @@ HTML_TEMPLATE = """
                         <span class="tree-icon file">&#128196;</span>
                         {{ file.name }}
                     </a>
-                    {% if file.name.lower().endswith('.json') %}
-                    <a href="/{{ file.path }}?view" class="tree-action">View</a>
+                    {% if file.is_json %}
+                    <a href="{{ file.view_url }}" class="tree-action">View</a>
                     {% endif %}
                 </span>
                 <span class="tree-size">{{ file.size_display }}</span>
@@ -777,6 +1235,7 @@ HTML_TEMPLATE = """
             </div>
             {% endfor %}
             {% endif %}
+            </div>
         </div>
     </div>
 
@@ -795,6 +1254,8 @@ HTML_TEMPLATE = """
             </div>
         </div>
     </footer>
+
+    <script src="{{ asset_url('kgx.js') }}" defer></script>
 </body>
 </html>
 """
@@ -808,158 +1269,7 @@ JSON_VIEWER_TEMPLATE = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <link rel="icon" type="image/png" href="/public/favicon.png">
     <title>{{ file_name }} - Translator Ingests</title>
-    <style>
-        :root {
-            --bg: #f4f4f6;
-            --surface: #ffffff;
-            --surface-hover: #f8f8fa;
-            --border: #d4d4d8;
-            --text: #1e1e2e;
-            --text-dim: #71717a;
-            --accent: #7c3aed;
-            --accent-hover: #6d28d9;
-            --primary: #5b4b8a;
-            --primary-dark: #4a3a7a;
-        }
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        body {
-            font-family: 'SF Mono', 'Fira Code', 'Consolas', monospace;
-            background: var(--bg);
-            color: var(--text);
-            line-height: 1.6;
-        }
-        .header {
-            background: var(--primary);
-            border-bottom: 2px solid var(--primary-dark);
-            padding: 16px 24px;
-        }
-        .header-content {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-        .header h1 {
-            font-size: 1.1em;
-            font-weight: 600;
-            letter-spacing: 0.5px;
-            margin-bottom: 4px;
-            color: #ffffff;
-        }
-        .header .path {
-            font-size: 0.85em;
-            color: rgba(255, 255, 255, 0.7);
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px 24px;
-        }
-        .toolbar {
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 16px;
-            flex-wrap: wrap;
-        }
-        .btn {
-            display: inline-flex;
-            align-items: center;
-            gap: 8px;
-            background: var(--surface);
-            color: var(--text);
-            padding: 8px 16px;
-            border-radius: 6px;
-            text-decoration: none;
-            font-size: 0.85em;
-            border: 1px solid var(--border);
-            transition: all 0.15s;
-            cursor: pointer;
-        }
-        .btn:hover {
-            background: var(--accent);
-            color: #ffffff;
-            border-color: var(--accent);
-        }
-        .btn-primary {
-            background: var(--accent);
-            color: #ffffff;
-            border-color: var(--accent);
-        }
-        .btn-primary:hover {
-            background: var(--accent-hover);
-            border-color: var(--accent-hover);
-        }
-        .file-info {
-            display: flex;
-            gap: 24px;
-            font-size: 0.8em;
-            color: var(--text-dim);
-            margin-left: auto;
-        }
-        .file-info span {
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-        .viewer-container {
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-        }
-        .viewer-header {
-            padding: 12px 16px;
-            background: #fafafb;
-            border-bottom: 2px solid var(--border);
-            font-size: 0.85em;
-            font-weight: 600;
-            color: var(--text);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .copy-btn {
-            padding: 4px 12px;
-            font-size: 0.9em;
-            background: var(--surface);
-        }
-        .json-content {
-            padding: 20px;
-            overflow-x: auto;
-            max-height: calc(100vh - 280px);
-            overflow-y: auto;
-        }
-        pre {
-            margin: 0;
-            font-family: 'SF Mono', 'Fira Code', 'Consolas', monospace;
-            font-size: 0.85em;
-            line-height: 1.5;
-        }
-        code {
-            display: block;
-        }
-        /* JSON Syntax Highlighting */
-        .json-key { color: #0451a5; font-weight: 500; }
-        .json-string { color: #a31515; }
-        .json-number { color: #098658; }
-        .json-boolean { color: #0000ff; font-weight: 600; }
-        .json-null { color: #0000ff; font-weight: 600; }
-        .json-punctuation { color: #000000; }
-        @media (max-width: 768px) {
-            .file-info {
-                width: 100%;
-                margin-left: 0;
-                margin-top: 8px;
-            }
-            .json-content {
-                font-size: 0.75em;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('viewer.css') }}">
 </head>
 <body>
     <div class="header">
@@ -992,60 +1302,26 @@ JSON_VIEWER_TEMPLATE = """
             </div>
         </div>
 
+        {% if truncated %}
+        <div class="truncated-notice">
+            This file is too large to view in full. Showing the first {{ preview_size }} of {{ file_size }}.
+            <a href="{{ download_url }}" download>Download the file</a> to see all of it.
+        </div>
+        {% endif %}
+
         <div class="viewer-container">
             <div class="viewer-header">
                 <span>JSON Content</span>
+                <button type="button" class="btn copy-btn" id="copy-json" disabled>Copy</button>
             </div>
             <div class="json-content">
-                <pre><code id="json-code">{{ json_content }}</code></pre>
+                <pre><code id="json-code" data-src="{{ source_url }}"{% if truncated %} data-preview-bytes="{{ preview_bytes }}"{% endif %}>Loading&hellip;</code></pre>
             </div>
         </div>
     </div>
 
-    <script>
-        // Syntax highlighting
-        function highlightJSON() {
-            const codeElement = document.getElementById('json-code');
-            let text = codeElement.textContent;
-
-            // Escape HTML
-            text = text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
-
-            // Highlight different JSON elements
-            text = text.replace(/"([^"]+)":/g, '<span class="json-key">"$1"</span>:');
-            text = text.replace(/: "([^"]*)"/g, ': <span class="json-string">"$1"</span>');
-            text = text.replace(/: (-?\\d+\\.?\\d*)/g, ': <span class="json-number">$1</span>');
-            text = text.replace(/: (true|false)/g, ': <span class="json-boolean">$1</span>');
-            text = text.replace(/: (null)/g, ': <span class="json-null">$1</span>');
-
-            codeElement.innerHTML = text;
-        }
-
-        // Copy to clipboard
-        function copyToClipboard() {
-            const code = document.getElementById('json-code').textContent;
-            navigator.clipboard.writeText(code).then(() => {
-                const icon = document.getElementById('copy-icon');
-                const btn = icon.parentElement;
-                const originalText = btn.innerHTML;
-                btn.innerHTML = '<span>&#10003;</span> Copied!';
-                btn.style.background = '#10b981';
-                btn.style.color = '#ffffff';
-                btn.style.borderColor = '#10b981';
-                setTimeout(() => {
-                    btn.innerHTML = originalText;
-                    btn.style.background = '';
-                    btn.style.color = '';
-                    btn.style.borderColor = '';
-                }, 2000);
-            }).catch(err => {
-                alert('Failed to copy to clipboard');
-            });
-        }
-
-        // Apply syntax highlighting on load
-        highlightJSON();
-    </script>
+    <script src="{{ asset_url('clipboard.js') }}" defer></script>
+    <script src="{{ asset_url('viewer.js') }}" defer></script>
 </body>
 </html>
 """
@@ -1059,136 +1335,7 @@ DOCS_TEMPLATE = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <link rel="icon" type="image/png" href="/public/favicon.png">
     <title>Download Files - KGX Storage</title>
-    <style>
-        :root {
-            --bg: #f4f4f6;
-            --surface: #ffffff;
-            --text: #1e1e2e;
-            --text-dim: #71717a;
-            --accent: #7c3aed;
-            --primary: #5b4b8a;
-        }
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        body {
-            font-family: 'SF Mono', 'Fira Code', 'Consolas', monospace;
-            background: var(--bg);
-            color: var(--text);
-            line-height: 1.6;
-        }
-        .header {
-            background: var(--primary);
-            padding: 16px 24px;
-        }
-        .header-content {
-            max-width: 1200px;
-            margin: 0 auto;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .header h1 {
-            font-size: 1.1em;
-            font-weight: 600;
-            letter-spacing: 0.5px;
-            color: #ffffff;
-        }
-        .header-nav a {
-            color: rgba(255, 255, 255, 0.9);
-            text-decoration: none;
-            font-size: 0.85em;
-            padding: 6px 12px;
-            transition: all 0.15s;
-        }
-        .header-nav a:hover {
-            color: #ffffff;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 40px 24px;
-        }
-        h2 {
-            font-size: 1.4em;
-            font-weight: 600;
-            margin: 40px 0 20px 0;
-            color: var(--primary);
-        }
-        .intro {
-            font-size: 1em;
-            color: var(--text-dim);
-            margin-bottom: 40px;
-        }
-        .cmd-block {
-            background: #2d2d2d;
-            color: #e5e7eb;
-            padding: 16px 20px;
-            margin: 12px 0;
-            font-size: 0.9em;
-            cursor: pointer;
-            transition: all 0.2s;
-            position: relative;
-        }
-        .cmd-block:hover {
-            background: #3a3a3a;
-        }
-        .cmd-block::after {
-            content: 'click to copy';
-            position: absolute;
-            right: 20px;
-            top: 16px;
-            font-size: 0.75em;
-            color: var(--accent);
-            opacity: 0;
-            transition: opacity 0.2s;
-        }
-        .cmd-block:hover::after {
-            opacity: 1;
-        }
-        .cmd-block.copied::after {
-            content: 'copied!';
-            color: #10b981;
-            opacity: 1;
-        }
-        .cmd-label {
-            font-size: 0.8em;
-            color: var(--accent);
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            margin: 20px 0 8px 0;
-            font-weight: 500;
-        }
-        .note {
-            font-size: 0.85em;
-            color: var(--text-dim);
-            margin: 8px 0 20px 0;
-            font-style: italic;
-        }
-        .path {
-            color: var(--accent);
-            font-family: monospace;
-            font-size: 0.9em;
-            display: block;
-            margin: 8px 0;
-        }
-        .container code {
-            font-family: monospace;
-            font-size: 0.9em;
-            background: #f4f4f6;
-            padding: 1px 4px;
-            border-radius: 3px;
-        }
-        @media (max-width: 768px) {
-            .header-content {
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 12px;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('docs.css') }}">
 </head>
 <body>
     <div class="header">
@@ -1211,14 +1358,14 @@ DOCS_TEMPLATE = """
         <h2>HTTPS Download</h2>
         
         <div class="cmd-label">Single File</div>
-        <div class="cmd-block" onclick="copy(this)">curl -fL -O "{{ site_url }}/releases/go_cam/latest/go_cam.tar.zst"</div>
+        <div class="cmd-block">curl -fL -O "{{ site_url }}/releases/go_cam/latest/go_cam.tar.zst"</div>
         <p class="note">Replace go_cam with your source name</p>
         
         <div class="cmd-label">Specific Version</div>
-        <div class="cmd-block" onclick="copy(this)">curl -fL -O "{{ site_url }}/data/ctd/May_2026/transform_1adbe97e/normalization_2025sep1_2.4.1_1.4.0_conflated_strict/merge_2.0.0/merged_nodes.jsonl"</div>
+        <div class="cmd-block">curl -fL -O "{{ site_url }}/data/ctd/May_2026/transform_1adbe97e/normalization_2025sep1_2.4.1_1.4.0_conflated_strict/merge_2.0.0/merged_nodes.jsonl"</div>
         
         <div class="cmd-label">With wget</div>
-        <div class="cmd-block" onclick="copy(this)">wget "{{ site_url }}/releases/alliance/latest/alliance.tar.zst"</div>
+        <div class="cmd-block">wget "{{ site_url }}/releases/alliance/latest/alliance.tar.zst"</div>
         
         <h2>Understanding curl Flags</h2>
         <p style="margin-bottom: 16px;">The recommended curl command uses <code>-fL</code> flags to ensure reliable file downloads:</p>
@@ -1233,20 +1380,20 @@ DOCS_TEMPLATE = """
         <p class="note">Requires AWS CLI and credentials with read access to <code>s3://{{ bucket }}/</code>. Prefer the HTTPS commands above if you do not have AWS access.</p>
         
         <div class="cmd-label">Install AWS CLI</div>
-        <div class="cmd-block" onclick="copy(this)">brew install awscli</div>
+        <div class="cmd-block">brew install awscli</div>
         <p class="note">macOS</p>
-        <div class="cmd-block" onclick="copy(this)">sudo apt install awscli</div>
+        <div class="cmd-block">sudo apt install awscli</div>
         <p class="note">Ubuntu/Debian</p>
         
         <div class="cmd-label">Single File</div>
-        <div class="cmd-block" onclick="copy(this)">aws s3 cp s3://{{ bucket }}/releases/go_cam/latest/go_cam.tar.zst .</div>
+        <div class="cmd-block">aws s3 cp s3://{{ bucket }}/releases/go_cam/latest/go_cam.tar.zst .</div>
         
         <div class="cmd-label">Entire Directory (Recursively)</div>
-        <div class="cmd-block" onclick="copy(this)">aws s3 sync s3://{{ bucket }}/releases/alliance/latest/ ./alliance/</div>
+        <div class="cmd-block">aws s3 sync s3://{{ bucket }}/releases/alliance/latest/ ./alliance/</div>
         <p class="note">Downloads all files in directory</p>
         
         <div class="cmd-label">List Available Files</div>
-        <div class="cmd-block" onclick="copy(this)">aws s3 ls s3://{{ bucket }}/releases/</div>
+        <div class="cmd-block">aws s3 ls s3://{{ bucket }}/releases/</div>
 
         <h2>Common Paths</h2>
         
@@ -1264,28 +1411,68 @@ DOCS_TEMPLATE = """
         <h2>Extract Archives</h2>
         
         <div class="cmd-label">Install zstd</div>
-        <div class="cmd-block" onclick="copy(this)">brew install zstd</div>
+        <div class="cmd-block">brew install zstd</div>
         <p class="note">macOS</p>
-        <div class="cmd-block" onclick="copy(this)">sudo apt install zstd</div>
+        <div class="cmd-block">sudo apt install zstd</div>
         <p class="note">Ubuntu/Debian</p>
         
         <div class="cmd-label">Extract .tar.zst</div>
-        <div class="cmd-block" onclick="copy(this)">tar --use-compress-program=zstd -xvf go_cam.tar.zst</div>
+        <div class="cmd-block">tar --use-compress-program=zstd -xvf go_cam.tar.zst</div>
     </div>
 
+    <script src="{{ asset_url('clipboard.js') }}" defer></script>
     <script>
-        function copy(el) {
-            navigator.clipboard.writeText(el.textContent.trim()).then(() => {
-                el.classList.add('copied');
-                setTimeout(() => el.classList.remove('copied'), 2000);
-            });
-        }
+        // One listener for every command block instead of an onclick on each
+        document.addEventListener('click', e => {
+            const block = e.target.closest('.cmd-block');
+            if (block) kgxCopy(block, block.textContent.trim());
+        });
     </script>
 </body>
 </html>
 """
 
 
+def _is_comment_line(line):
+    """True for a stripped line that is a whole CSS, JS or HTML comment."""
+    return (
+        line.startswith("//")
+        or (line.startswith("/*") and line.endswith("*/"))
+        or (line.startswith("<!--") and line.endswith("-->"))
+    )
+
+
+def _minify_template(template):
+    """Drop indentation, blank lines and whole-line comments from an HTML template.
+
+    No block in the templates is whitespace-sensitive across lines (the one
+    <pre> is a single line), so line breaks are kept and the rest goes. Tags are
+    not joined: a line break between inline elements renders as a space.
+    """
+    lines = (line.strip() for line in template.splitlines())
+    return "\n".join(line for line in lines if line and not _is_comment_line(line))
+
+
+# Parse the page templates once at import instead of on every request
+HTML_PAGE = app.jinja_env.from_string(_minify_template(HTML_TEMPLATE))
+JSON_VIEWER_PAGE = app.jinja_env.from_string(_minify_template(JSON_VIEWER_TEMPLATE))
+# The docs page depends only on settings fixed at startup, so it is rendered just once
+DOCS_PAGE_BYTES = app.jinja_env.from_string(_minify_template(DOCS_TEMPLATE)).render(
+    bucket=BUCKET_NAME, site_url=SITE_URL
+).encode("utf-8")
+# Compressed at maximum level ahead of time; Flask-Compress leaves encoded responses alone
+DOCS_PAGE_ENCODED = {
+    "br": brotli.compress(DOCS_PAGE_BYTES, quality=11),
+    "gzip": gzip.compress(DOCS_PAGE_BYTES, compresslevel=9),
+}
+DOCS_PAGE_ETAG = hashlib.blake2b(DOCS_PAGE_BYTES, digest_size=16).hexdigest()
+# Part of the viewer's ETag, so a changed template or asset invalidates browser copies
+_JSON_VIEWER_ASSETS = ("viewer.css", "clipboard.js", "viewer.js")
+JSON_VIEWER_VERSION = hashlib.md5(
+    "".join([JSON_VIEWER_TEMPLATE, *map(asset_url, _JSON_VIEWER_ASSETS)]).encode("utf-8")
+).hexdigest()[:8]
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "5000"))
     if _use_anonymous_s3():